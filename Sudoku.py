@@ -1,5 +1,7 @@
 import streamlit as st
 
+from sudoku_core.resources import warm_up
+
 st.set_page_config(
     page_title="Sudoku Game",
     page_icon="🎮",
@@ -20,3 +22,6 @@ st.markdown(
 """
 )
 
+# the game pages need pandas and the puzzle bank, so load them while the
+# player reads this; started last so the page itself is not held up
+warm_up()
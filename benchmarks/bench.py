@@ -0,0 +1,253 @@
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from sudoku_core.batch import parse_line
+from sudoku_core.batch_validator import validate_boards
+from sudoku_core.board import unflatten
+from sudoku_core.canon import canonical
+from sudoku_core.generator import generate
+from sudoku_core.render import _render, render_board_with_borders
+from sudoku_core.solver import solve_sudoku, solve_values
+from sudoku_core.tables import geometry_for_cells
+from sudoku_core.validator import is_valid_sudoku
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CORPORA_DIR = os.path.join(HERE, 'corpora')
+BASELINE_FILE = os.path.join(HERE, 'baseline.json')
+ROOT = os.path.dirname(HERE)
+CORPORA = ['easy', 'hard', '17clue', 'pathological', '16x16', '16x16-hard', '25x25']
+# puzzles generated per run for each tier, the slow tiers get fewer
+GENERATE_COUNTS = {'easy': 50, 'medium': 20, 'hard': 10, 'expert': 10}
+# Streamlit pages timed from a fresh process and on reruns, as (name, script)
+PAGES = [
+    ('home', 'Sudoku.py'),
+    ('classic', os.path.join('pages', '1_🎮_Classic Mode.py')),
+    ('practice', os.path.join('pages', '2_🎮_Practice Mode.py')),
+    ('easy', '1 Easy.py'),
+]
+# run in a new interpreter per sample: loads Streamlit's test harness, then
+# prints how long the page's first run took, imports included
+_COLD_RUN = '''
+import sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+start = time.perf_counter()
+at.run()
+print(time.perf_counter() - start)
+'''
+
+
+def load_corpus(name):
+    with open(os.path.join(CORPORA_DIR, name + '.txt')) as f:
+        return [parse_line(line) for line in f if line.strip()]
+
+
+# Every benchmark returns (samples, items): the seconds each timed call took
+# and how many puzzles those calls handled between them.
+
+def bench_solve(puzzles, repeat, engine='masks'):
+    # build the board size's tables (and links) up front so the first puzzle does not pay for them
+    geometry_for_cells(len(puzzles[0]))
+    solve_sudoku(unflatten(puzzles[0]), engine)
+    samples = []
+    for _ in range(repeat):
+        for values in puzzles:
+            grid = unflatten(values)
+            start = time.perf_counter()
+            solve_sudoku(grid, engine)
+            samples.append(time.perf_counter() - start)
+    return samples, len(samples)
+
+
+def bench_solve_dlx(puzzles, repeat):
+    return bench_solve(puzzles, repeat, 'dlx')
+
+
+def bench_validate(boards, repeat):
+    samples = []
+    for _ in range(repeat):
+        for board in boards:
+            start = time.perf_counter()
+            is_valid_sudoku(board)
+            samples.append(time.perf_counter() - start)
+    return samples, len(samples)
+
+
+def bench_validate_batch(boards, repeat):
+    # one call is too quick to time on its own, so check many copies at once
+    boards = np.tile(np.asarray(boards, dtype=np.uint8), (50, 1, 1))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        validate_boards(boards)
+        samples.append(time.perf_counter() - start)
+    return samples, len(boards) * repeat
+
+
+def bench_render(boards, repeat):
+    # the renderer is memoized, so clear the cache to time the real work
+    samples = []
+    for _ in range(repeat):
+        for board in boards:
+            _render.cache_clear()
+            start = time.perf_counter()
+            render_board_with_borders(board)
+            samples.append(time.perf_counter() - start)
+    return samples, len(samples)
+
+
+def bench_canonical(puzzles, repeat):
+    samples = []
+    for _ in range(repeat):
+        for values in puzzles:
+            start = time.perf_counter()
+            canonical(values)
+            samples.append(time.perf_counter() - start)
+    return samples, len(samples)
+
+
+def bench_generate(difficulty, repeat):
+    rng = random.Random(0)
+    samples = []
+    for _ in range(repeat * GENERATE_COUNTS[difficulty]):
+        start = time.perf_counter()
+        generate(difficulty, rng)
+        samples.append(time.perf_counter() - start)
+    return samples, len(samples)
+
+
+def bench_page_cold(script, repeat):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', _COLD_RUN, os.path.join(ROOT, script)], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        samples.append(float(out.split()[-1]))
+    return samples, len(samples)
+
+
+def bench_page_warm(script, repeat):
+    # imported here so the other benchmarks run without Streamlit's test harness
+    from streamlit.testing.v1 import AppTest
+
+    # Streamlit reads .streamlit/config.toml from the working directory
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=60)
+        at.run()
+        # reruns are timed once anything the first run started in the background is done
+        for thread in threading.enumerate():
+            if thread.name == 'sudoku-warm-up':
+                thread.join()
+        samples = []
+        for _ in range(repeat * 4):
+            start = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - start)
+    finally:
+        os.chdir(cwd)
+    return samples, len(samples)
+
+
+def benchmarks():
+    """(name, function, argument) for every benchmark, in report order."""
+    corpora = {name: load_corpus(name) for name in CORPORA}
+    solved = [unflatten(solve_values(values)) for values in corpora['easy'] + corpora['hard']]
+    cases = [(f'solve/{name}', bench_solve, corpora[name]) for name in CORPORA]
+    cases += [(f'solve_dlx/{name}', bench_solve_dlx, corpora[name]) for name in CORPORA]
+    cases += [
+        ('validate/solved', bench_validate, solved),
+        ('validate_batch/solved', bench_validate_batch, solved),
+        ('render/easy', bench_render, [unflatten(values) for values in corpora['easy']]),
+    ]
+    cases += [(f'canonical/{name}', bench_canonical, corpora[name]) for name in ('easy', 'hard', '17clue')]
+    cases += [(f'generate/{tier}', bench_generate, tier) for tier in GENERATE_COUNTS]
+    cases += [(f'page_cold/{name}', bench_page_cold, script) for name, script in PAGES]
+    cases += [(f'page_warm/{name}', bench_page_warm, script) for name, script in PAGES]
+    return cases
+
+
+def summarize(samples, items):
+    ordered = sorted(samples)
+    return {
+        'median': statistics.median(ordered),
+        'p99': ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.99) - 1)],
+        'rate': items / sum(ordered),
+    }
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.3f}ms"
+
+
+def report(results, baseline, threshold, out):
+    """Write one line per benchmark and return the names whose median regressed past ``threshold``."""
+    regressions = []
+    out.write(f"{'benchmark':<24}{'median':>12}{'p99':>12}{'puzzles/s':>12}  vs baseline\n")
+    for name, stats in results.items():
+        line = f"{name:<24}{_ms(stats['median']):>12}{_ms(stats['p99']):>12}{stats['rate']:>12.1f}"
+        base = baseline.get(name)
+        if base:
+            change = stats['median'] / base['median'] - 1
+            line += f"  {change:+.1%}"
+            if change > threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        out.write(line + '\n')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the solvers, validators, renderer, canonical form, generator and pages.")
+    parser.add_argument('--repeat', type=int, default=5, help="passes over each corpus (default: 5)")
+    parser.add_argument('--only', default='', help="run only benchmarks whose name starts with this")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="median slowdown that counts as a regression (default: 0.25, i.e. 25%%)")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('-o', '--output', default='-', help="report file, or - for stdout (default)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, bench, arg in benchmarks():
+        if name.startswith(args.only):
+            results[name] = summarize(*bench(arg, args.repeat))
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        regressions = report(results, baseline, args.threshold, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.save_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                results = {**json.load(f), **results}
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,141 +1,35 @@
 import streamlit as st
-import copy
-import time
 
-st.set_page_config(page_title="Play Sudoku: Classic Mode", page_icon="🎮")
+from sudoku_core import Board, load_game, save_game
+from sudoku_core.bank import draw_puzzle
+from sudoku_core.board_input import apply_board_edits, board_editor, reset_board_editor
+from sudoku_core.conflicts import ConflictTracker
+from sudoku_core.generator import DIFFICULTIES
+from sudoku_core.render import add_css, render_board_with_borders
+from sudoku_core.session import session_slot
+from sudoku_core.timer import elapsed_seconds, init_timer_state, reset_timer, restore_timer, show_timer, start_timer, stop_timer
 
+st.set_page_config(page_title="Play Sudoku: Classic Mode", page_icon="🎮")
 
-initial_board = [
-    [0, 0, 0, 6, 0, 0, 4, 0, 0],
-    [7, 0, 0, 0, 0, 3, 6, 0, 0],
-    [0, 0, 0, 0, 9, 1, 0, 8, 0],
-    [0, 0, 0, 0, 0, 0, 0, 0, 0],
-    [0, 5, 0, 1, 8, 0, 0, 0, 3],
-    [0, 0, 0, 3, 0, 6, 0, 4, 5],
-    [0, 4, 0, 2, 0, 0, 0, 6, 0],
-    [9, 0, 3, 0, 0, 0, 0, 0, 0],
-    [0, 2, 0, 0, 0, 0, 1, 0, 0]
-]
-
-def is_valid_sudoku(board):
-    rows = [set() for _ in range(9)]
-    cols = [set() for _ in range(9)]
-    sub_grids = [set() for _ in range(9)]
-
-    for i in range(9):
-        for j in range(9):
-            num = board[i][j]
-            if num == 0:
-                return False
-            subgrid_index = (i // 3) * 3 + j // 3
-            if num in rows[i] or num in cols[j] or num in sub_grids[subgrid_index]:
-                return False
-            rows[i].add(num)
-            cols[j].add(num)
-            sub_grids[subgrid_index].add(num)
-    return True
-
-
-def is_safe(grid, row, col, num):
-    for x in range(9):
-        if grid[row][x] == num or grid[x][col] == num:
-            return False
-    start_row, start_col = row - row % 3, col - col % 3
-    for i in range(3):
-        for j in range(3):
-            if grid[i + start_row][j + start_col] == num:
-                return False
-    return True
-
-def save_game(board):
-    with open('saved_game.txt', 'w') as file:
-        for row in board:
-            file.write(' '.join(map(str, row)) + '\n')
-
-def load_game():
-    with open('saved_game.txt', 'r') as file:
-        board = [list(map(int, line.strip().split())) for line in file]
-    return board
-
-def add_css():
-    st.markdown(
-        """
-        <style>
-        .sudoku-table td {
-            border: 1px solid #000;
-            text-align: center;
-            width: 50px;
-            height: 50px;
-        }
-        .sudoku-table .top { border-top: 3px solid #000; }
-        .sudoku-table .left { border-left: 3px solid #000; }
-        .sudoku-table .bottom { border-bottom: 3px solid #000; }
-        .sudoku-table .right { border-right: 3px solid #000; }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
 
-def render_board_with_borders(board):
-    html = "<table class='sudoku-table'>"
-    for i, row in enumerate(board):
-        html += "<tr>"
-        for j, cell in enumerate(row):
-            cell_class = []
-            if i % 3 == 0:
-                cell_class.append("top")
-            if j % 3 == 0:
-                cell_class.append("left")
-            if i == 8:
-                cell_class.append("bottom")
-            if j == 8:
-                cell_class.append("right")
-            class_attr = " ".join(cell_class)
-            html += f"<td class='{class_attr}'>{cell if cell != 0 else ''}</td>"
-        html += "</tr>"
-    html += "</table>"
-    return html
+if 'initial_board' not in st.session_state:
+    st.session_state.initial_board = Board.from_rows(draw_puzzle('medium'))
+initial_board = st.session_state.initial_board
 
 if 'board_input' not in st.session_state:
-    st.session_state.board_input = copy.deepcopy(initial_board)
-if 'running' not in st.session_state:
-    st.session_state.running = False
-if 'start_time' not in st.session_state:
-    st.session_state.start_time = None
-if 'elapsed_time' not in st.session_state:
-    st.session_state.elapsed_time = 0
-
-def start_timer():
-    if st.session_state.start_time is None:
-        st.session_state.start_time = time.time()
-    else:
-        st.session_state.start_time = time.time() - st.session_state.elapsed_time
-    st.session_state.running = True
-
-def stop_timer():
-    if st.session_state.running:
-        st.session_state.elapsed_time = time.time() - st.session_state.start_time
-    st.session_state.running = False
-
-def reset_timer():
-    st.session_state.elapsed_time = 0
-    st.session_state.start_time = None
-    st.session_state.running = False
-
-def display_input_boxes(board):
-    for i in range(9):
-        cols = st.columns(9, gap='small')
-        for j in range(9):
-            value = board[i][j]
-            if initial_board[i][j] != 0:
-                cols[j].markdown(f"<div style='display:flex;align-items:center;justify-content:center;height:38px;'>"
-                                 f"{value}</div>", unsafe_allow_html=True)
-            else:
-                new_value = cols[j].text_input(f"Cell {i+1},{j+1}", str(value) if value != 0 else "", key=f"{i},{j}", max_chars=1)
-                if new_value.isdigit() and 1 <= int(new_value) <= 9:
-                    board[i][j] = int(new_value)
-                elif new_value == "":
-                    board[i][j] = 0
+    st.session_state.board_input = initial_board.snapshot()
+if 'conflicts' not in st.session_state:
+    st.session_state.conflicts = ConflictTracker(st.session_state.board_input)
+init_timer_state()
+
+def new_game(difficulty):
+    st.session_state.initial_board = Board.from_rows(draw_puzzle(difficulty))
+    st.session_state.board_input = st.session_state.initial_board.snapshot()
+    st.session_state.conflicts.load(st.session_state.board_input)
+    # a replay of the old puzzle would pick up again in Practice Mode
+    st.session_state.replay = None
+    reset_board_editor(st.session_state.board_input)
+    reset_timer()
 
 def main():
     st.title("Sudoku Game: Classic Mode")
@@ -164,7 +58,9 @@ def main():
 
     board_display = st.empty()
 
-    display_input_boxes(board_input)
+    editor_display = st.empty()
+    for i, j, value in apply_board_edits(board_input, initial_board):
+        st.session_state.conflicts.set(i, j, value)
 
     st.sidebar.subheader("Actions")
     timer_display = st.sidebar.empty()
@@ -179,16 +75,24 @@ def main():
         stop_timer()
 
     if st.sidebar.button("Save Draft"):
-        save_game(board_input)
+        save_game(session_slot(), initial_board, board_input, elapsed_seconds())
         st.sidebar.success("Draft saved successfully.✅")
 
     if st.sidebar.button("Load Draft"):
-        st.session_state.board_input = load_game()
-        st.sidebar.success("Game loaded successfully.✅")
-        st.experimental_rerun()
+        saved = load_game(session_slot())
+        if saved is None:
+            st.sidebar.warning("There is no saved draft yet.❌")
+        else:
+            st.session_state.initial_board, st.session_state.board_input, elapsed = saved
+            restore_timer(elapsed)
+            st.session_state.conflicts.load(st.session_state.board_input)
+            st.session_state.replay = None
+            reset_board_editor(st.session_state.board_input)
+            st.sidebar.success("Game loaded successfully.✅")
+            st.rerun()
 
     if st.sidebar.button("Submit"):
-        if is_valid_sudoku(board_input):
+        if st.session_state.conflicts.is_solved():
             st.sidebar.success("Congratulations, you have solved the Sudoku.✅")
             st.sidebar.success(f"You have spent: {st.session_state.elapsed_time:.0f} seconds")
             if st.session_state.running:
@@ -198,19 +102,21 @@ def main():
 
     if st.sidebar.button("Reset"):
         reset_timer()
-        st.session_state.board_input = copy.deepcopy(initial_board)
-        st.experimental_rerun()
+        st.session_state.board_input = initial_board.snapshot()
+        st.session_state.conflicts.load(st.session_state.board_input)
+        st.session_state.replay = None
+        reset_board_editor(st.session_state.board_input)
+        st.rerun()
+
+    difficulty = st.sidebar.selectbox("Difficulty", list(DIFFICULTIES))
+    st.sidebar.button("New Game", on_click=new_game, args=(difficulty,))
 
     add_css()
-    board_display.markdown(render_board_with_borders(board_input), unsafe_allow_html=True)
+    board_display.markdown(render_board_with_borders(board_input, st.session_state.conflicts.conflict_cells()), unsafe_allow_html=True)
 
-    while st.session_state.running:
-        elapsed_time = time.time() - st.session_state.start_time
-        timer_display.success(f'Time Spent: {elapsed_time:.0f} seconds')
-        time.sleep(1)
+    board_editor(editor_display)
 
-    if not st.session_state.running:
-        timer_display.success(f'Time Spent: {st.session_state.elapsed_time:.0f} seconds')
+    show_timer(timer_display, 'Time Spent', 'success')
 
 if __name__ == "__main__":
     main()
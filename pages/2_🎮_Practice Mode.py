@@ -1,169 +1,46 @@
 import streamlit as st
-import copy
-import time
 
-st.set_page_config(page_title="Play Sudoku: Practice Mode", page_icon="🎮")
-
-
-initial_board = [
-    [0, 0, 0, 2, 6, 0, 7, 0, 1],
-    [6, 8, 0, 0, 7, 0, 0, 9, 0],
-    [1, 9, 0, 0, 0, 4, 5, 0, 0],
-    [8, 2, 0, 1, 0, 0, 0, 4, 0],
-    [0, 0, 4, 6, 0, 2, 9, 0, 0],
-    [0, 5, 0, 0, 0, 3, 0, 2, 8],
-    [0, 0, 9, 3, 0, 0, 0, 7, 4],
-    [0, 4, 0, 0, 5, 0, 0, 3, 6],
-    [7, 0, 3, 0, 1, 8, 0, 0, 0]
-]
-
-def is_valid_sudoku(board):
-    rows = [set() for _ in range(9)]
-    cols = [set() for _ in range(9)]
-    sub_grids = [set() for _ in range(9)]
-
-    for i in range(9):
-        for j in range(9):
-            num = board[i][j]
-            if num == 0:
-                return False
-
-            subgrid_index = (i // 3) * 3 + j // 3
-
-            if num in rows[i] or num in cols[j] or num in sub_grids[subgrid_index]:
-                return False
-
-            rows[i].add(num)
-            cols[j].add(num)
-            sub_grids[subgrid_index].add(num)
+from sudoku_core import PRACTICE_BOARD, Board, load_game, save_game
+from sudoku_core.bank import draw_puzzle
+from sudoku_core.board_input import apply_board_edits, board_editor, reset_board_editor
+from sudoku_core.cache import solve_position
+from sudoku_core.conflicts import ConflictTracker
+from sudoku_core.generator import DIFFICULTIES
+from sudoku_core.hints import HintEngine
+from sudoku_core.render import add_css, render_board_with_borders
+from sudoku_core.replay import Replay, play_replay, show_replay_outcome
+from sudoku_core.session import session_slot
+from sudoku_core.solver import SOLVE_TIME_LIMIT, UNSOLVABLE
+from sudoku_core.timer import elapsed_seconds, init_timer_state, reset_timer, restore_timer, show_timer, start_timer, stop_timer
 
-    return True
-
-def is_safe(grid, row, col, num):
-    for x in range(9):
-        if grid[row][x] == num or grid[x][col] == num:
-            return False
-
-    start_row, start_col = row - row % 3, col - col % 3
-    for i in range(3):
-        for j in range(3):
-            if grid[i + start_row][j + start_col] == num:
-                return False
-    return True
-
-def solve_sudoku(grid, row=0, col=0):
-    if row == 8 and col == 9:
-        return True
-    if col == 9:
-        row += 1
-        col = 0
-    if grid[row][col] != 0:
-        return solve_sudoku(grid, row, col + 1)
-    
-    for num in range(1, 10):
-        if is_safe(grid, row, col, num):
-            grid[row][col] = num
-            if solve_sudoku(grid, row, col + 1):
-                return True
-        grid[row][col] = 0
-    return False
-
-def save_game(board):
-    with open('saved_game.txt', 'w') as file:
-        for row in board:
-            file.write(' '.join(map(str, row)) + '\n')
-
-def load_game():
-    with open('saved_game.txt', 'r') as file:
-        board = [list(map(int, line.strip().split())) for line in file]
-    return board
+st.set_page_config(page_title="Play Sudoku: Practice Mode", page_icon="🎮")
 
-def add_css():
-    st.markdown(
-        """
-        <style>
-        .sudoku-table td {
-            border: 1px solid #000;
-            text-align: center;
-            width: 50px;
-            height: 50px;
-        }
-        .sudoku-table .top { border-top: 3px solid #000; }
-        .sudoku-table .left { border-left: 3px solid #000; }
-        .sudoku-table .bottom { border-bottom: 3px solid #000; }
-        .sudoku-table .right { border-right: 3px solid #000; }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
 
-def render_board_with_borders(board):
-    html = "<table class='sudoku-table'>"
-    for i, row in enumerate(board):
-        html += "<tr>"
-        for j, cell in enumerate(row):
-            cell_class = []
-            if i % 3 == 0:
-                cell_class.append("top")
-            if j % 3 == 0:
-                cell_class.append("left")
-            if i == 8:
-                cell_class.append("bottom")
-            if j == 8:
-                cell_class.append("right")
-            class_attr = " ".join(cell_class)
-            html += f"<td class='{class_attr}'>{cell if cell != 0 else ''}</td>"
-        html += "</tr>"
-    html += "</table>"
-    return html
+if 'initial_board' not in st.session_state:
+    st.session_state.initial_board = Board.from_rows(PRACTICE_BOARD)
+initial_board = st.session_state.initial_board
 
 if 'board_input' not in st.session_state:
-    st.session_state.board_input = copy.deepcopy(initial_board)
-if 'running' not in st.session_state:
-    st.session_state.running = False
-if 'start_time' not in st.session_state:
-    st.session_state.start_time = None
-if 'elapsed_time' not in st.session_state:
-    st.session_state.elapsed_time = 0
-
-def start_timer():
-    if st.session_state.start_time is None:
-        st.session_state.start_time = time.time()
-    else:
-        st.session_state.start_time = time.time() - st.session_state.elapsed_time
-    st.session_state.running = True
-
-def stop_timer():
-    if st.session_state.running:
-        st.session_state.elapsed_time = time.time() - st.session_state.start_time
-    st.session_state.running = False
-
-def reset_timer():
-    st.session_state.elapsed_time = 0
-    st.session_state.start_time = None
-    st.session_state.running = False
-
-def suggest_values(board, row, col):
-    possible_values = []
-    for num in range(1, 10):
-        if is_safe(board, row, col, num):
-            possible_values.append(num)
-    return possible_values
-
-def display_input_boxes(board):
-    for i in range(9):
-        cols = st.columns(9, gap='small')
-        for j in range(9):
-            value = board[i][j]
-            if initial_board[i][j] != 0:
-                cols[j].markdown(f"<div style='display:flex;align-items:center;justify-content:center;height:38px;'>"
-                                 f"{value}</div>", unsafe_allow_html=True)
-            else:
-                new_value = cols[j].text_input(f"Cell {i+1},{j+1}", str(value) if value != 0 else "", key=f"{i},{j}", max_chars=1)
-                if new_value.isdigit() and 1 <= int(new_value) <= 9:
-                    board[i][j] = int(new_value)
-                elif new_value == "":
-                    board[i][j] = 0
+    st.session_state.board_input = initial_board.snapshot()
+if 'conflicts' not in st.session_state:
+    st.session_state.conflicts = ConflictTracker(st.session_state.board_input)
+if 'hints' not in st.session_state:
+    st.session_state.hints = HintEngine(st.session_state.board_input)
+elif not st.session_state.hints.matches(st.session_state.board_input):
+    # Classic Mode shares the board but has no hint engine, so catch up with whatever it changed
+    st.session_state.hints.load(st.session_state.board_input)
+if 'replay' not in st.session_state:
+    st.session_state.replay = None
+init_timer_state()
+
+def new_game(difficulty):
+    st.session_state.initial_board = Board.from_rows(draw_puzzle(difficulty))
+    st.session_state.board_input = st.session_state.initial_board.snapshot()
+    st.session_state.conflicts.load(st.session_state.board_input)
+    st.session_state.hints.load(st.session_state.board_input)
+    st.session_state.replay = None
+    reset_board_editor(st.session_state.board_input)
+    reset_timer()
 
 def main():
     st.title("Sudoku Game: Practice Mode")
@@ -180,7 +57,7 @@ def main():
     '''
     1. Start the timer and Stop the timer as you want
     2. Fill in a number below the board to solve the Sudoku
-    3. You can practice solving or use hints to get the right answer.
+    3. You can practice solving or use hints to get the right answer. Next Step explains the next logical move and Replay solve plays the whole solve back step by step.
     4. Save Daft is used to save your game right away and Load Draft is used to load the saved draft you have already saved to the board.
     5. After finish solving, submit your answer to test. If it shows "Congratulation" bar is mean all your answers are correct and if not, it will show "Warning" bar.
     6. You can reset the game whenever you want by using "Reset".
@@ -191,8 +68,12 @@ def main():
     st.write("Fill in the blank spaces correctly to solve it.")
 
     board_display = st.empty()
+    replay_status = st.empty()
 
-    display_input_boxes(board_input)
+    editor_display = st.empty()
+    for i, j, value in apply_board_edits(board_input, initial_board):
+        st.session_state.conflicts.set(i, j, value)
+        st.session_state.hints.set(i, j, value)
 
     st.sidebar.subheader("Actions")
     timer_display = st.sidebar.empty()
@@ -212,30 +93,75 @@ def main():
 
     if selected_cell:
         cell_coords = [int(coord) - 1 for coord in selected_cell.split()[1].split(",")]
-        hint = suggest_values(board_input, *cell_coords)
+        hint = st.session_state.hints.candidates(*cell_coords)
         if hint:
             st.sidebar.info(f"Hint for {selected_cell}: {hint} 💡")
         else:
             st.sidebar.error(f"No hint available for {selected_cell} ❌")
 
+    if st.sidebar.button("Next Step"):
+        if st.session_state.conflicts.has_conflicts():
+            st.sidebar.warning("Fix the numbers highlighted on the board first.❌")
+        else:
+            step = st.session_state.hints.next_hint()
+            if step is not None:
+                st.sidebar.info(f"{step.technique.capitalize()}: {step.explanation} 💡")
+            else:
+                # the techniques are stuck, so give away one cell of the (cached) solution
+                cell = st.session_state.hints.most_constrained()
+                position = board_input.snapshot()
+                if cell and solve_position(position, initial_board, time_limit=SOLVE_TIME_LIMIT).solutions == 1:
+                    row, col = cell
+                    st.sidebar.info(f"No logical step found, but {position[row][col]} goes in cell {row + 1},{col + 1}. 💡")
+                else:
+                    st.sidebar.error("No logical step found, try a guess or show all answers.❌")
+
     if st.sidebar.button("Show all answers"):
-        if solve_sudoku(board_input):
+        result = solve_position(board_input, initial_board, time_limit=SOLVE_TIME_LIMIT)
+        if result.status == UNSOLVABLE:
+            st.sidebar.warning("No solution fits the numbers on the board.❌")
+        elif result.solutions > 1:
+            st.sidebar.warning("This puzzle has more than one solution, showing one of them.")
+        elif not result.solutions:
+            st.sidebar.warning(f"Gave up after {result.elapsed:.1f} seconds, please check the numbers on the board.❌")
+        if result.solutions:
+            st.session_state.conflicts.load(board_input)
+            st.session_state.hints.load(board_input)
+            reset_board_editor(board_input)
             st.sidebar.success("Sudoku is now solved.✅")
             if st.session_state.running:
                 stop_timer()
 
+    replay_speed = st.sidebar.slider("Replay speed (steps per second)", 1, 50, 5)
+    if st.sidebar.button("Replay solve"):
+        if st.session_state.conflicts.has_conflicts():
+            st.sidebar.warning("Fix the numbers highlighted on the board first.❌")
+        else:
+            st.session_state.replay = Replay(board_input)
+    if st.session_state.replay is not None and st.sidebar.button("Stop replay"):
+        st.session_state.replay = None
+
 
     if st.sidebar.button("Save Draft"):
-        save_game(board_input)
+        save_game(session_slot(), initial_board, board_input, elapsed_seconds())
         st.sidebar.success("Draft saved successfully.✅")
 
     if st.sidebar.button("Load Draft"):
-        st.session_state.board_input = load_game()
-        st.sidebar.success("Game loaded successfully.✅")
-        st.experimental_rerun()
+        saved = load_game(session_slot())
+        if saved is None:
+            st.sidebar.warning("There is no saved draft yet.❌")
+        else:
+            st.session_state.initial_board, st.session_state.board_input, elapsed = saved
+            restore_timer(elapsed)
+            st.session_state.conflicts.load(st.session_state.board_input)
+            st.session_state.hints.load(st.session_state.board_input)
+            st.session_state.replay = None
+            reset_board_editor(st.session_state.board_input)
+            st.sidebar.success("Game loaded successfully.✅")
+            st.rerun()
 
     if st.sidebar.button("Submit"):
-        if is_valid_sudoku(board_input):
+        if st.session_state.conflicts.is_solved():
             st.sidebar.success("Congratulations, you have solved the Sudoku.✅")
             st.sidebar.success(f"You have spent: {st.session_state.elapsed_time:.0f} seconds")
             if st.session_state.running:
@@ -245,19 +171,27 @@ def main():
 
     if st.sidebar.button("Reset"):
         reset_timer()
-        st.session_state.board_input = copy.deepcopy(initial_board)
-        st.experimental_rerun()
+        st.session_state.board_input = initial_board.snapshot()
+        st.session_state.conflicts.load(st.session_state.board_input)
+        st.session_state.hints.load(st.session_state.board_input)
+        st.session_state.replay = None
+        reset_board_editor(st.session_state.board_input)
+        st.rerun()
+
+    difficulty = st.sidebar.selectbox("Difficulty", list(DIFFICULTIES))
+    st.sidebar.button("New Game", on_click=new_game, args=(difficulty,))
 
     add_css()
-    board_display.markdown(render_board_with_borders(board_input), unsafe_allow_html=True)
+    if st.session_state.replay is None:
+        board_display.markdown(render_board_with_borders(board_input, st.session_state.conflicts.conflict_cells()), unsafe_allow_html=True)
+        show_replay_outcome(replay_status)
+    else:
+        with board_display.container():
+            play_replay(replay_speed)
 
-    while st.session_state.running:
-        elapsed_time = time.time() - st.session_state.start_time
-        timer_display.success(f'Time Spent: {elapsed_time:.0f} seconds')
-        time.sleep(1)
+    board_editor(editor_display)
 
-    if not st.session_state.running:
-        timer_display.success(f'Time Spent: {st.session_state.elapsed_time:.0f} seconds')
+    show_timer(timer_display, 'Time Spent', 'success')
 
 if __name__ == "__main__":
     main()
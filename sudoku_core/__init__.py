@@ -0,0 +1,4 @@
+from sudoku_core.board import CLASSIC_BOARD, PRACTICE_BOARD, Board
+from sudoku_core.persistence import load_game, save_game
+from sudoku_core.solver import count_solutions, solve, solve_steps, solve_sudoku, solve_values
+from sudoku_core.validator import has_unique_solution, is_safe, is_valid_sudoku, safe_values
@@ -0,0 +1,227 @@
+import argparse
+import json
+import mmap
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sudoku_core.batch import map_chunks, parse_line
+from sudoku_core.board import decode, encode, unflatten
+from sudoku_core.canon import canonical, random_variant
+from sudoku_core.generator import DIFFICULTIES, difficulty_of, generate, generate_puzzle
+from sudoku_core.solver import Budget, SearchStopped, count_values
+
+BANK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'puzzle_bank')
+DATA_FILE = 'puzzles.bin'
+INDEX_FILE = 'index.json'
+RECORD_SIZE = 81
+# search nodes an imported puzzle may take to prove it has one solution
+MAX_NODES = 200000
+# imported lines per task
+IMPORT_CHUNK = 500
+# rounds of generation a build may take to fill every tier
+GENERATE_ROUNDS = 10
+
+
+class PuzzleBank:
+    """Read-only view of a bank built by ``build_bank``.
+
+    Records are grouped by difficulty and sorted by clue count, and the index
+    maps each difficulty to ``[clues, first_record, count]`` runs, so a draw is
+    one random offset into a memory-mapped file. Pages share the OS page cache
+    instead of each loading the bank into memory. Puzzles are stored in
+    canonical form, one record per puzzle however many disguises it came in.
+    """
+
+    def __init__(self, path=BANK_DIR):
+        with open(os.path.join(path, INDEX_FILE)) as file:
+            self.index = json.load(file)
+        self._file = open(os.path.join(path, DATA_FILE), 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def _span(self, difficulty, clues=None):
+        runs = self.index.get(difficulty, [])
+        if clues is not None:
+            runs = [run for run in runs if run[0] == clues]
+        if not runs:
+            return 0, 0
+        # runs of one difficulty are contiguous in the file
+        return runs[0][1], sum(run[2] for run in runs)
+
+    def count(self, difficulty, clues=None):
+        return self._span(difficulty, clues)[1]
+
+    def get(self, n):
+        return decode(self._data[n * RECORD_SIZE:(n + 1) * RECORD_SIZE])
+
+    def draw(self, difficulty, clues=None, rng=None):
+        start, count = self._span(difficulty, clues)
+        if not count:
+            raise LookupError(f"No {difficulty} puzzles with {clues} clues in the bank")
+        return self.get(start + (rng or random).randrange(count))
+
+
+_banks = {}
+# the warm-up thread and page scripts can open the bank at the same time
+_banks_lock = threading.Lock()
+
+
+def open_bank(path=BANK_DIR):
+    """Open the bank at ``path`` once per process; returns None if it was never built."""
+    with _banks_lock:
+        if path not in _banks:
+            _banks[path] = PuzzleBank(path) if os.path.exists(os.path.join(path, INDEX_FILE)) else None
+        return _banks[path]
+
+
+def draw_puzzle(difficulty='medium', rng=None):
+    """Draw a 9x9 board from the bank, generating one if the bank has none for this tier.
+
+    A banked puzzle comes back relabeled, reordered and maybe transposed at
+    random, so the same record rarely looks the same twice.
+    """
+    bank = open_bank()
+    if bank is None or not bank.count(difficulty):
+        return generate_puzzle(difficulty, rng)
+    return random_variant(unflatten(bank.draw(difficulty, rng=rng)), rng)
+
+
+def _generate_one(args):
+    # canonical form and difficulty of a generated puzzle, graded again since
+    # ``generate`` hands back its last attempt even when it missed the tier
+    difficulty, seed = args
+    puzzle, _ = generate(difficulty, random.Random(seed))
+    return encode(canonical(puzzle)[0]), difficulty_of(puzzle)
+
+
+def _vet(values):
+    # canonical form and difficulty of an imported puzzle, or None unless it
+    # is a 9x9 puzzle with exactly one solution found within MAX_NODES
+    if values is None or len(values) != RECORD_SIZE:
+        return None
+    try:
+        if count_values(values, 2, Budget(max_nodes=MAX_NODES)) != 1:
+            return None
+    except SearchStopped:
+        return None
+    return encode(canonical(values)[0]), difficulty_of(values)
+
+
+def _vet_chunk(lines):
+    return [_vet(parse_line(line)) for line in lines]
+
+
+def _read_lines(paths):
+    for path in paths:
+        with open(path) as file:
+            yield from file
+
+
+def _bank_records(path):
+    # (difficulty, record) for every puzzle already in the bank at ``path``
+    if not os.path.exists(os.path.join(path, INDEX_FILE)):
+        return []
+    bank = PuzzleBank(path)
+    records = []
+    try:
+        for difficulty in bank.index:
+            start, count = bank._span(difficulty)
+            records += [(difficulty, bank._data[n * RECORD_SIZE:(n + 1) * RECORD_SIZE])
+                        for n in range(start, start + count)]
+    finally:
+        bank.close()
+    return records
+
+
+def build_bank(path=BANK_DIR, per_tier=250, workers=None, seed=0, imports=()):
+    """Add the puzzles in the ``imports`` files that have one solution to the
+    bank at ``path``, generate puzzles for every difficulty left with fewer
+    than ``per_tier``, and write the bank out again.
+
+    Puzzles already in the bank are kept, every new puzzle is filed under the
+    difficulty it grades as, and puzzles that are the same up to symmetry are
+    kept once. Returns the number of puzzles in the bank.
+    """
+    os.makedirs(path, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    tiers = {difficulty: [] for difficulty in DIFFICULTIES}
+    seen = set()
+
+    def add(record, difficulty):
+        if record not in seen:
+            seen.add(record)
+            tiers[difficulty].append(record)
+
+    for difficulty, record in _bank_records(path):
+        add(record, difficulty)
+    with ProcessPoolExecutor(workers) as pool:
+        # imported files are read a chunk at a time, however large they are
+        for vetted in map_chunks(pool, _read_lines(imports), _vet_chunk, workers, IMPORT_CHUNK):
+            for result in vetted:
+                if result is not None:
+                    add(*result)
+        # seeds carry on from the puzzles already there, and a round makes up
+        # for puzzles that were duplicates or graded into another tier
+        next_seed = {difficulty: len(tiers[difficulty]) for difficulty in DIFFICULTIES}
+        for _ in range(GENERATE_ROUNDS):
+            jobs = []
+            for difficulty, puzzles in tiers.items():
+                short = per_tier - len(puzzles)
+                if short > 0:
+                    jobs += [(difficulty, f"{seed}:{difficulty}:{n}") for n in range(next_seed[difficulty], next_seed[difficulty] + short)]
+                    next_seed[difficulty] += short
+            if not jobs:
+                break
+            for record, difficulty in pool.map(_generate_one, jobs, chunksize=max(1, len(jobs) // (workers * 16))):
+                add(record, difficulty)
+
+    index = {}
+    records = 0
+    tmp_data = os.path.join(path, DATA_FILE + '.tmp')
+    with open(tmp_data, 'wb') as out:
+        for difficulty, puzzles in tiers.items():
+            puzzles.sort(key=lambda record: RECORD_SIZE - record.count(b'0'))
+            runs = []
+            for record in puzzles:
+                clues = RECORD_SIZE - record.count(b'0')
+                if runs and runs[-1][0] == clues:
+                    runs[-1][2] += 1
+                else:
+                    runs.append([clues, records, 1])
+                out.write(record)
+                records += 1
+            index[difficulty] = runs
+    tmp_index = os.path.join(path, INDEX_FILE + '.tmp')
+    with open(tmp_index, 'w') as file:
+        json.dump(index, file)
+    # processes that already mapped the old file keep reading it
+    os.replace(tmp_data, os.path.join(path, DATA_FILE))
+    os.replace(tmp_index, os.path.join(path, INDEX_FILE))
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add to the on-disk puzzle bank, or create it.")
+    parser.add_argument('--out', default=BANK_DIR, help="bank directory (default: %(default)s)")
+    parser.add_argument('--per-tier', type=int, default=250,
+                        help="puzzles each difficulty should have at least; short tiers are topped up by generating")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--import', dest='imports', action='append', default=[], metavar='FILE',
+                        help="also add the puzzles in FILE, one per line (can be repeated)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = build_bank(args.out, args.per_tier, args.workers, args.seed, args.imports)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {records} puzzles to {args.out} in {elapsed:.1f}s ({records / elapsed:.0f} puzzles/s)")
+
+
+if __name__ == '__main__':
+    main()
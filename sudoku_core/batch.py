@@ -0,0 +1,135 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sudoku_core.board import SIDE_OF_CELLS, VALUE_OF, encode
+from sudoku_core.solver import Budget, SearchStopped, solve_values
+
+UNSOLVED = '-'
+# written for a puzzle that used up its budget, so one hard line cannot hold up a worker
+TIMED_OUT = 'timeout'
+# search budget per puzzle; the slowest corpus puzzles need well under a thousand nodes
+MAX_NODES = 1000000
+TIME_LIMIT = 10.0
+
+
+def parse_line(line):
+    """Parse a puzzle line, one symbol per cell ('0' or '.' for empty); None if malformed.
+
+    81 characters make a 9x9 puzzle; 16, 256 and 625 make 4x4, 16x16 and
+    25x25 ones, which use 'A'-'P' for the digits past 9.
+    """
+    line = line.strip().upper()
+    side = SIDE_OF_CELLS.get(len(line))
+    if side is None:
+        return None
+    values = []
+    for ch in line.replace('.', '0').encode('ascii', 'replace'):
+        value = VALUE_OF[ch]
+        if not 0 <= value <= side:
+            return None
+        values.append(value)
+    return values
+
+
+def solve_line(line):
+    values = parse_line(line)
+    if values is None:
+        return UNSOLVED
+    try:
+        solved = solve_values(values, Budget(max_nodes=MAX_NODES, time_limit=TIME_LIMIT))
+    except SearchStopped:
+        return TIMED_OUT
+    if solved is None:
+        return UNSOLVED
+    return encode(solved).decode('ascii')
+
+
+def solve_chunk(lines):
+    return [solve_line(line) for line in lines]
+
+
+def _chunks(lines, size):
+    chunk = []
+    for line in lines:
+        if not line.strip():
+            continue
+        chunk.append(line)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def map_chunks(pool, lines, work, workers, chunk_size=1000):
+    """Yield ``work(chunk)`` for chunks of ``lines`` run on ``pool``, in input order.
+
+    At most ``2 * workers`` chunks are in flight at a time, so memory stays
+    flat however long the input is. ``work`` must be a module-level function.
+    """
+    pending = deque()
+    for chunk in _chunks(lines, chunk_size):
+        pending.append(pool.submit(work, chunk))
+        if len(pending) >= workers * 2:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def map_stream(lines, out, work, workers=None, chunk_size=1000):
+    """Run ``work`` over chunks of ``lines`` across a process pool, writing
+    the lines it returns in input order.
+
+    ``work`` takes a list of lines and returns one output line per input
+    line, ending in ``-`` or ``timeout`` for a puzzle it could not handle.
+    Returns (puzzles, done).
+    """
+    workers = workers or os.cpu_count() or 1
+    puzzles = done = 0
+    with ProcessPoolExecutor(workers) as pool:
+        for results in map_chunks(pool, lines, work, workers, chunk_size):
+            for result in results:
+                out.write(result + '\n')
+                puzzles += 1
+                done += not result.endswith((UNSOLVED, TIMED_OUT))
+    return puzzles, done
+
+
+def solve_stream(lines, out, workers=None, chunk_size=1000):
+    """Solve puzzles from ``lines`` across a process pool, writing one line per puzzle in input order.
+
+    Unsolvable or malformed puzzles are written as ``-``, and puzzles that run
+    past MAX_NODES or TIME_LIMIT as ``timeout``. Returns (puzzles, solved).
+    """
+    return map_stream(lines, out, solve_chunk, workers, chunk_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a file of puzzles, one line of 81 (or 16, 256, 625) characters per puzzle.")
+    parser.add_argument('input', help="puzzle file, or - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="solution file, or - for stdout (default)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="puzzles per task")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    start = time.perf_counter()
+    try:
+        puzzles, solved = solve_stream(source, out, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    rate = puzzles / elapsed if elapsed else 0
+    print(f"Solved {solved} of {puzzles} puzzles in {elapsed:.1f}s ({rate:.0f} puzzles/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
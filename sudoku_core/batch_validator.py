@@ -0,0 +1,48 @@
+import numpy as np
+
+DIGITS = np.arange(1, 10, dtype=np.uint8)
+
+
+def _check(boards, return_conflicts):
+    n = len(boards)
+    # one_hot[b, r, c, d] is True when cell (r, c) of board b holds digit d + 1
+    one_hot = boards[..., None] == DIGITS
+    row_counts = one_hot.sum(axis=2, dtype=np.uint8)
+    col_counts = one_hot.sum(axis=1, dtype=np.uint8)
+    box_counts = one_hot.reshape(n, 3, 3, 3, 3, 9).sum(axis=(2, 4), dtype=np.uint8)
+
+    # every unit holds each digit exactly once, which also rules out empty cells
+    valid = ((row_counts == 1).all(axis=(1, 2))
+             & (col_counts == 1).all(axis=(1, 2))
+             & (box_counts == 1).all(axis=(1, 2, 3)))
+    if not return_conflicts:
+        return valid, None
+
+    repeated = ((row_counts > 1)[:, :, None, :]
+                | (col_counts > 1)[:, None, :, :]
+                | (box_counts > 1).repeat(3, axis=1).repeat(3, axis=2))
+    conflicts = np.argwhere((one_hot & repeated).any(axis=-1))
+    return valid, conflicts
+
+
+def validate_boards(boards, return_conflicts=False, chunk_size=65536):
+    """Check many solved boards at once.
+
+    ``boards`` is anything that converts to an ``(N, 9, 9)`` uint8 array.
+    Returns a boolean vector with one entry per board and, when
+    ``return_conflicts`` is set, an ``(K, 3)`` array of ``(board, row, col)``
+    for every cell whose digit repeats in its row, column or box. Boards are
+    processed ``chunk_size`` at a time to bound the temporary arrays.
+    """
+    boards = np.asarray(boards, dtype=np.uint8).reshape(-1, 9, 9)
+    valid = np.empty(len(boards), dtype=bool)
+    conflicts = []
+    for start in range(0, len(boards), chunk_size):
+        chunk_valid, chunk_conflicts = _check(boards[start:start + chunk_size], return_conflicts)
+        valid[start:start + chunk_size] = chunk_valid
+        if return_conflicts:
+            chunk_conflicts[:, 0] += start
+            conflicts.append(chunk_conflicts)
+    if not return_conflicts:
+        return valid
+    return valid, np.concatenate(conflicts) if conflicts else np.empty((0, 3), dtype=np.intp)
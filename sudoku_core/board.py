@@ -0,0 +1,155 @@
+CLASSIC_BOARD = [
+    [0, 0, 0, 6, 0, 0, 4, 0, 0],
+    [7, 0, 0, 0, 0, 3, 6, 0, 0],
+    [0, 0, 0, 0, 9, 1, 0, 8, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 5, 0, 1, 8, 0, 0, 0, 3],
+    [0, 0, 0, 3, 0, 6, 0, 4, 5],
+    [0, 4, 0, 2, 0, 0, 0, 6, 0],
+    [9, 0, 3, 0, 0, 0, 0, 0, 0],
+    [0, 2, 0, 0, 0, 0, 1, 0, 0]
+]
+
+PRACTICE_BOARD = [
+    [0, 0, 0, 2, 6, 0, 7, 0, 1],
+    [6, 8, 0, 0, 7, 0, 0, 9, 0],
+    [1, 9, 0, 0, 0, 4, 5, 0, 0],
+    [8, 2, 0, 1, 0, 0, 0, 4, 0],
+    [0, 0, 4, 6, 0, 2, 9, 0, 0],
+    [0, 5, 0, 0, 0, 3, 0, 2, 8],
+    [0, 0, 9, 3, 0, 0, 0, 7, 4],
+    [0, 4, 0, 0, 5, 0, 0, 3, 6],
+    [7, 0, 3, 0, 1, 8, 0, 0, 0]
+]
+
+
+# One-byte-per-cell encoding used by the puzzle bank and saved games: an
+# ASCII symbol per cell in row-major order, '0' for an empty cell, '1'-'9'
+# and then 'A'-'P' for 10-25 on the larger boards. A 9x9 board is 81 bytes.
+SYMBOLS = '0123456789ABCDEFGHIJKLMNOP'
+SYMBOL_BYTES = SYMBOLS.encode('ascii')
+# value of each byte, -1 for bytes that are not symbols
+VALUE_OF = [SYMBOL_BYTES.find(b) for b in range(256)]
+# board sides the engine supports, and their cell counts
+SIDES = (4, 9, 16, 25)
+SIDE_OF_CELLS = {n * n: n for n in SIDES}
+
+
+def encode(values):
+    return bytes(SYMBOL_BYTES[v] for v in values)
+
+
+def decode(record):
+    return [VALUE_OF[b] for b in record]
+
+
+def flatten(board):
+    return [int(cell) for row in board for cell in row]
+
+
+def unflatten(values):
+    n = SIDE_OF_CELLS[len(values)]
+    return [list(values[r * n:r * n + n]) for r in range(n)]
+
+
+class _Row:
+    __slots__ = ('_board', '_start')
+
+    def __init__(self, board, row):
+        self._board = board
+        self._start = row * board.size
+
+    def __getitem__(self, col):
+        return VALUE_OF[self._board._cells[self._start + col]]
+
+    def __setitem__(self, col, value):
+        self._board.set(self._start + col, value)
+
+    def __iter__(self):
+        return (VALUE_OF[b] for b in self._board._cells[self._start:self._start + self._board.size])
+
+    def __len__(self):
+        return self._board.size
+
+
+class Board:
+    """A board kept as its one-byte-per-cell record (see ``encode``), 81 bytes for 9x9.
+
+    Rows index like the nested lists used elsewhere (``board[r][c]``).
+    ``snapshot`` shares the record until either copy is written to, so
+    resets and saves do not copy the board, and ``to_string``/``encode``
+    hand the record out as is.
+    """
+
+    __slots__ = ('_cells', 'size')
+
+    def __init__(self, record=b'0' * 81):
+        if len(record) not in SIDE_OF_CELLS:
+            raise ValueError(f"a board record is 16, 81, 256 or 625 bytes, not {len(record)}")
+        # bytes while shared with a snapshot, bytearray once written to
+        self._cells = record
+        self.size = SIDE_OF_CELLS[len(record)]
+
+    @classmethod
+    def empty(cls, size=9):
+        return cls(b'0' * (size * size))
+
+    @classmethod
+    def from_rows(cls, rows):
+        if isinstance(rows, Board):
+            return rows.snapshot()
+        return cls(encode(int(cell) for row in rows for cell in row))
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(encode(values))
+
+    @classmethod
+    def from_string(cls, text):
+        return cls(text.encode('ascii'))
+
+    def snapshot(self):
+        if not isinstance(self._cells, bytes):
+            self._cells = bytes(self._cells)
+        return Board(self._cells)
+
+    copy = snapshot
+
+    def set(self, index, value):
+        cells = self._cells
+        if isinstance(cells, bytes):
+            cells = self._cells = bytearray(cells)
+        cells[index] = SYMBOL_BYTES[value]
+
+    def values(self):
+        return decode(self._cells)
+
+    def load(self, values):
+        self._cells = encode(values)
+
+    def encode(self):
+        return bytes(self._cells)
+
+    def to_string(self):
+        return self._cells.decode('ascii')
+
+    __str__ = to_string
+
+    def __repr__(self):
+        return f"Board({self.to_string()!r})"
+
+    def __getitem__(self, row):
+        return _Row(self, row)
+
+    def __iter__(self):
+        return (_Row(self, r) for r in range(self.size))
+
+    def __len__(self):
+        return self.size
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self._cells == other._cells
+        return NotImplemented
+
+    __hash__ = None
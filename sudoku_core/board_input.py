@@ -0,0 +1,91 @@
+import streamlit as st
+
+from sudoku_core.board import Board
+
+COLUMNS = [str(c + 1) for c in range(9)]
+COLUMN_CONFIG = {
+    name: st.column_config.TextColumn(name, max_chars=1, validate=r"^[1-9]?$", width="small")
+    for name in COLUMNS
+}
+
+
+# The whole board is one st.data_editor. Its data is a snapshot of the board
+# (the "base") taken whenever the board changes outside the editor, and
+# Streamlit reports the player's entries as a small edited_rows delta against
+# that snapshot, so a keystroke round-trips a few cells instead of 81 widgets.
+
+def _widget_key(key):
+    return f"{key}_{st.session_state[key + '_version']}"
+
+
+def _parse(text):
+    text = (text or '').strip()
+    if text == '':
+        return 0
+    if len(text) == 1 and '1' <= text <= '9':
+        return int(text)
+    return None
+
+
+def _frame(base):
+    # pandas takes longer to import than anything else a page needs, and only
+    # the editor uses it, so it is imported on the first call
+    import pandas as pd
+
+    return pd.DataFrame([[str(v) if v else '' for v in row] for row in base], columns=COLUMNS)
+
+
+def reset_board_editor(board, key='board_editor'):
+    """Show ``board`` in the editor from the next run on, dropping pending entries."""
+    # a snapshot shares the board's 81-byte record until one of them is written to
+    st.session_state[key + '_base'] = Board.from_rows(board)
+    st.session_state[key + '_version'] = st.session_state.get(key + '_version', 0) + 1
+    st.session_state[key + '_seen'] = {}
+
+
+def apply_board_edits(board, givens, key='board_editor'):
+    """Copy the editor's new entries into ``board`` and return them as (row, col, value).
+
+    Only cells whose entry changed since the last run are touched. Entries on
+    given cells or that are not a single digit are dropped, and the editor is
+    reset so it shows the board again.
+    """
+    if key + '_base' not in st.session_state:
+        reset_board_editor(board, key)
+    state = st.session_state.get(_widget_key(key))
+    if not state:
+        return []
+    base = st.session_state[key + '_base']
+    seen = st.session_state[key + '_seen']
+    current = {
+        (int(row), COLUMNS.index(col)): text
+        for row, cells in state['edited_rows'].items() for col, text in cells.items()
+    }
+
+    changes = []
+    rejected = False
+    for i, j in set(current) | set(seen):
+        text = current.get((i, j))
+        if text == seen.get((i, j)) and (i, j) in current:
+            continue
+        if givens[i][j]:
+            rejected = True
+            continue
+        value = _parse(text) if (i, j) in current else base[i][j]
+        if value is None:
+            rejected = True
+            continue
+        if board[i][j] != value:
+            board[i][j] = value
+            changes.append((i, j, value))
+    st.session_state[key + '_seen'] = current
+    if rejected:
+        reset_board_editor(board, key)
+    return changes
+
+
+def board_editor(container, key='board_editor'):
+    # the frame is rebuilt from the base on every run rather than kept in the session
+    frame = _frame(st.session_state[key + '_base'])
+    container.data_editor(frame, key=_widget_key(key), hide_index=True, column_config=COLUMN_CONFIG)
+
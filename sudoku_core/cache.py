@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sudoku_core.board import Board, decode, encode
+from sudoku_core.canon import canonical, undo
+from sudoku_core.solver import SOLVED, UNSOLVABLE, SolveResult, _read_grid, _write_grid, solve
+
+# entries kept before the least recently used one is dropped; an entry is
+# two 81-byte records, so a full cache stays around a megabyte
+CACHE_SIZE = 4096
+# fewer clues than this never have a unique solution, and very sparse boards
+# are slow to put in canonical form, so they are solved directly
+MIN_CLUES = 17
+
+
+class SolutionCache:
+    """Solutions of puzzles, shared by every session in the process.
+
+    Entries are keyed by the puzzle's canonical form, so a puzzle that is a
+    relabeled, reordered or rotated copy of one solved before is a hit. The
+    cache holds at most ``size`` puzzles and forgets the least recently used.
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def lookup(self, values, time_limit=None):
+        """Solve a flat board through the cache, like ``solve`` with the default limit.
+
+        Returns (SolveResult, first solution or None). A search that runs out
+        of time is not cached.
+        """
+        start = time.perf_counter()
+        if sum(1 for v in values if v) < MIN_CLUES:
+            return _solve(values, time_limit)
+        form, transform = canonical(values)
+        key = encode(form)
+        entry = self._get(key)
+        if entry is None:
+            result, solved = _solve(form, time_limit)
+            if result.status in (SOLVED, UNSOLVABLE):
+                self._put(key, (result.solutions, solved and encode(solved)))
+            return result, solved and undo(transform, solved)
+        solutions, record = entry
+        result = SolveResult(SOLVED if solutions else UNSOLVABLE, solutions, 0, time.perf_counter() - start)
+        return result, record and undo(transform, decode(record))
+
+
+def _solve(values, time_limit):
+    board = Board.from_values(values)
+    result = solve(board, time_limit=time_limit)
+    return result, board.values() if result.solutions else None
+
+
+solution_cache = SolutionCache()
+
+
+def solve_position(board, initial, time_limit=None):
+    """Solve ``board``, a position reached by filling in cells of the puzzle
+    ``initial``, the way ``solve`` does, with ``initial`` solved through the
+    cache. While the puzzle has one solution, whether the position can be
+    finished only depends on whether its entries agree with that solution.
+    """
+    result, solved = solution_cache.lookup(_read_grid(initial), time_limit)
+    if result.status != SOLVED:
+        # the puzzle itself has no solution, or the search ran out of time
+        return result._replace(solutions=0)
+    if result.solutions > 1:
+        return solve(board, time_limit=time_limit)
+    if any(v and v != s for v, s in zip(_read_grid(board), solved)):
+        return result._replace(status=UNSOLVABLE, solutions=0)
+    _write_grid(board, solved)
+    return result
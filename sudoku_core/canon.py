@@ -0,0 +1,189 @@
+import math
+import random
+from collections import namedtuple
+from itertools import permutations
+
+from sudoku_core.board import Board, flatten, unflatten
+
+# The symmetries of a board: relabeling the digits, reordering the bands and
+# the rows inside each band, reordering the stacks and the columns inside
+# each stack, and transposing. Rotations and reflections are combinations of
+# these. The canonical form of a puzzle is the smallest flat list (empty
+# cells first, digits numbered in order of first appearance) any of them
+# can turn it into, so two puzzles are the same puzzle in disguise exactly
+# when their canonical forms are equal.
+
+# ``rows[k]`` and ``cols[k]`` are the rows and columns (of the board, after the
+# transpose) that become row and column k, ``digits[d]`` is what digit d becomes
+Transform = namedtuple('Transform', 'transpose rows cols digits')
+
+# sorts after every digit while a row's key is worked out, for a digit with no number yet
+_UNNUMBERED = 99
+
+
+def _transposed(values, n):
+    return [values[c * n + r] for r in range(n) for c in range(n)]
+
+
+def apply(transform, values):
+    """``values`` (a flat board) moved by ``transform``."""
+    n = len(transform.rows)
+    if transform.transpose:
+        values = _transposed(values, n)
+    digits = transform.digits
+    return [digits[values[r * n + c]] for r in transform.rows for c in transform.cols]
+
+
+def undo(transform, values):
+    """The flat board that ``transform`` turns into ``values``."""
+    n = len(transform.rows)
+    back = [0] * len(transform.digits)
+    for d, e in enumerate(transform.digits):
+        back[e] = d
+    out = [0] * (n * n)
+    for k, r in enumerate(transform.rows):
+        for m, c in enumerate(transform.cols):
+            out[r * n + c] = back[values[k * n + m]]
+    return _transposed(out, n) if transform.transpose else out
+
+
+def random_transform(n=9, rng=None):
+    """A random symmetry of an ``n`` x ``n`` board."""
+    rng = rng or random
+    box = math.isqrt(n)
+
+    def lines():
+        blocks = rng.sample(range(box), box)
+        return [b * box + k for b in blocks for k in rng.sample(range(box), box)]
+
+    return Transform(rng.random() < 0.5, lines(), lines(), [0] + rng.sample(range(1, n + 1), n))
+
+
+def random_variant(board, rng=None):
+    """A random puzzle equivalent to ``board`` (rows of digits or a Board), in the same format."""
+    values = apply(random_transform(len(board), rng), flatten(board))
+    if isinstance(board, Board):
+        return Board.from_values(values)
+    return unflatten(values)
+
+
+def _row_key(row, groups, digits, numbered, bound=None):
+    # the row as it reads once each group of interchangeable columns is
+    # sorted: empty cells, then numbered digits, then digits not numbered
+    # yet. Gives up with None as soon as the key is sure to exceed ``bound``
+    key = []
+    fresh = numbered
+    for group in groups:
+        if len(group) == 1:
+            # most groups are single columns once a few rows are placed
+            d = digits[row[group[0]]] if row[group[0]] else 0
+            if d == _UNNUMBERED:
+                fresh += 1
+                d = fresh
+            key.append(d)
+        else:
+            for d in sorted([digits[row[c]] if row[c] else 0 for c in group]):
+                if d == _UNNUMBERED:
+                    fresh += 1
+                    d = fresh
+                key.append(d)
+        if bound is not None and key > bound[:len(key)]:
+            return None
+    return key
+
+
+def _refine(row, groups, digits, numbered):
+    # every way of ordering the columns that gives ``row`` its smallest key, as
+    # (groups, digits, numbered). Empty cells stay interchangeable; columns
+    # holding digits not numbered yet are ordered every way, since the order
+    # decides which number each digit gets
+    partial = [((), digits, numbered)]
+    for group in groups:
+        if len(group) == 1 and (not row[group[0]] or digits[row[group[0]]] != _UNNUMBERED):
+            partial = [(groups_so_far + (group,), digits_so_far, count) for groups_so_far, digits_so_far, count in partial]
+            continue
+        empty = tuple(c for c in group if not row[c])
+        known = sorted((digits[row[c]], c) for c in group if row[c] and digits[row[c]] != _UNNUMBERED)
+        head = ((empty,) if empty else ()) + tuple((c,) for _, c in known)
+        fresh = [c for c in group if row[c] and digits[row[c]] == _UNNUMBERED]
+        if not fresh:
+            partial = [(groups_so_far + head, digits_so_far, count) for groups_so_far, digits_so_far, count in partial]
+            continue
+        grown = []
+        for groups_so_far, digits_so_far, count in partial:
+            for order in permutations(fresh):
+                numbers = digits_so_far[:]
+                for k, c in enumerate(order, count + 1):
+                    numbers[row[c]] = k
+                grown.append((groups_so_far + head + tuple((c,) for c in order), numbers, count + len(order)))
+        partial = grown
+    return partial
+
+
+def canonical(values):
+    """Canonical form of a flat board and a Transform that turns the board into it."""
+    n = math.isqrt(len(values))
+    box = math.isqrt(n)
+    bands = [list(range(b * box, b * box + box)) for b in range(box)]
+    start = [0] + [_UNNUMBERED] * n
+
+    # The first row only decides how many empty cells lead each stack, so
+    # rather than trying every order of the stacks for every row, the stacks
+    # are sorted by that count and only stacks that tie are tried both ways.
+    # A state is (board, transposed, rows so far, column groups, digit
+    # numbers, digits numbered); the columns inside each stack are put in
+    # order row by row after that.
+    first = []
+    for transpose in (False, True):
+        board = _transposed(values, n) if transpose else values
+        grid = [board[r * n:r * n + n] for r in range(n)]
+        for r, row in enumerate(grid):
+            empties = [row[s:s + box].count(0) for s in range(0, n, box)]
+            first.append((sorted(empties, reverse=True), grid, transpose, r, empties))
+    most = max(entry[0] for entry in first)
+    states = []
+    for order, grid, transpose, r, empties in first:
+        if order != most:
+            continue
+        for stacks in permutations(range(box)):
+            if [empties[s] for s in stacks] != most:
+                continue
+            groups = tuple(tuple(range(s * box, s * box + box)) for s in stacks)
+            for refined in _refine(grid[r], groups, start, 0):
+                states.append((grid, transpose, (r,)) + refined)
+    form = _row_key(states[0][0][states[0][2][0]], states[0][3], start, 0)
+
+    for slot in range(1, n):
+        best = None
+        chosen = []
+        for state in states:
+            grid, transpose, rows, groups, digits, numbered = state
+            if slot % box:
+                band = rows[-1] // box
+                candidates = [r for r in bands[band] if r not in rows]
+            else:
+                used = {r // box for r in rows}
+                candidates = [r for b in range(box) if b not in used for r in bands[b]]
+            for r in candidates:
+                key = _row_key(grid[r], groups, digits, numbered, best)
+                if key is None:
+                    continue
+                if best is None or key < best:
+                    best = key
+                    chosen = [(state, r)]
+                elif key == best:
+                    chosen.append((state, r))
+        form += best
+        states = []
+        for (grid, transpose, rows, groups, digits, numbered), r in chosen:
+            for refined in _refine(grid[r], groups, digits, numbered):
+                states.append((grid, transpose, rows + (r,)) + refined)
+
+    grid, transpose, rows, groups, digits, numbered = states[0]
+    cols = [c for group in groups for c in group]
+    # digits the board does not use take the numbers left over, in order
+    for d in range(1, n + 1):
+        if digits[d] == _UNNUMBERED:
+            numbered += 1
+            digits[d] = numbered
+    return form, Transform(transpose, list(rows), cols, digits)
@@ -0,0 +1,71 @@
+from sudoku_core.tables import geometry_for
+
+
+class ConflictTracker:
+    """Row, column and box digit counts for a board, updated one cell at a time.
+
+    Writing a cell is O(1), and so are ``is_solved`` and ``has_conflicts``,
+    so the pages can give live feedback without rescanning the board.
+    """
+
+    def __init__(self, board):
+        self.load(board)
+
+    def load(self, board):
+        g = self.geometry = geometry_for(len(board))
+        n = g.size
+        # one byte per cell, and one byte per (unit, digit) count: units are
+        # the rows, then the columns, then the boxes, n + 1 digits apiece
+        self.values = bytearray(g.cells)
+        self.counts = bytearray(3 * n * (n + 1))
+        self.filled = 0
+        # number of (unit, digit) pairs that appear more than once
+        self.repeats = 0
+        for i in range(g.cells):
+            self.set(g.row_of[i], g.col_of[i], int(board[g.row_of[i]][g.col_of[i]]))
+
+    def _units(self, row, col):
+        # offsets of the cell's row, column and box in ``counts``
+        g = self.geometry
+        stride = g.size + 1
+        return row * stride, (g.size + col) * stride, (2 * g.size + g.box_of[row * g.size + col]) * stride
+
+    def _count(self, k, delta):
+        before = self.counts[k]
+        self.counts[k] = before + delta
+        if delta > 0 and before == 1:
+            self.repeats += 1
+        elif delta < 0 and before == 2:
+            self.repeats -= 1
+
+    def set(self, row, col, value):
+        i = row * self.geometry.size + col
+        old = self.values[i]
+        if old == value:
+            return
+        units = self._units(row, col)
+        if old:
+            for unit in units:
+                self._count(unit + old, -1)
+            self.filled -= 1
+        if value:
+            for unit in units:
+                self._count(unit + value, 1)
+            self.filled += 1
+        self.values[i] = value
+
+    def has_conflicts(self):
+        return self.repeats > 0
+
+    def is_solved(self):
+        return self.filled == self.geometry.cells and self.repeats == 0
+
+    def is_conflict(self, row, col):
+        value = self.values[row * self.geometry.size + col]
+        return bool(value) and any(self.counts[unit + value] > 1 for unit in self._units(row, col))
+
+    def conflict_cells(self):
+        if not self.repeats:
+            return []
+        g = self.geometry
+        return [(g.row_of[i], g.col_of[i]) for i in range(g.cells) if self.is_conflict(g.row_of[i], g.col_of[i])]
@@ -0,0 +1,288 @@
+import functools
+import threading
+
+from sudoku_core.tables import geometry_for, geometry_for_cells
+
+# Dancing links (Knuth's Algorithm X) over the exact-cover form of a puzzle:
+# one row per (cell, digit) and one column per constraint. Each cell holds one
+# digit and each row, column and box (or jigsaw region) holds each digit once;
+# a diagonal puzzle adds one column per (diagonal, digit). Killer cages add
+# secondary columns, covered at most once, so no digit repeats in a cage,
+# and their sums are checked as rows are chosen.
+#
+# The links live in flat int lists. A matrix is built once per puzzle shape
+# and kept: a solve covers the givens, searches, and uncovers everything again
+# on the way out, which leaves the lists exactly as they were.
+
+
+class _Matrix:
+    def __init__(self, n, columns, rows, primary):
+        # node 0 is the root, nodes 1..columns are the column headers and the
+        # rest are the row nodes; only the first ``primary`` columns have to
+        # be covered, the others just may not be covered twice
+        size = 1 + columns + sum(len(row) for row in rows)
+        self.n = n
+        self.left = list(range(-1, size - 1))
+        self.right = list(range(1, size + 1))
+        self.up = list(range(size))
+        self.down = list(range(size))
+        self.column = list(range(size))
+        self.row_of = [-1] * size
+        self.count = [0] * (1 + columns)
+        self.first = []
+        self.lock = threading.Lock()
+
+        self.left[0] = primary
+        self.right[primary] = 0
+        for c in range(primary + 1, columns + 1):
+            self.left[c] = self.right[c] = c
+
+        node = columns + 1
+        for r, cols in enumerate(rows):
+            self.first.append(node)
+            for k, c in enumerate(cols):
+                c += 1
+                self.column[node] = c
+                self.row_of[node] = r
+                self.up[node] = self.up[c]
+                self.down[node] = c
+                self.down[self.up[c]] = node
+                self.up[c] = node
+                self.count[c] += 1
+                self.left[node] = node - 1 if k else node + len(cols) - 1
+                self.right[node] = node + 1 if k < len(cols) - 1 else node - k
+                node += 1
+        self.cols_of = [[c + 1 for c in cols] for cols in rows]
+
+    def cover(self, c):
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                count[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, c):
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                count[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+
+def _columns(g, diagonal, regions, cages):
+    n, cells = g.size, g.cells
+    region_of = regions if regions is not None else g.box_of
+    primary = 4 * cells + (2 * n if diagonal else 0)
+    cage_of = [-1] * cells
+    for k, (_, cage) in enumerate(cages):
+        for i in cage:
+            cage_of[i] = k
+    rows = []
+    for i in range(cells):
+        r, c = g.row_of[i], g.col_of[i]
+        for d in range(n):
+            cols = [i, cells + r * n + d, 2 * cells + c * n + d, 3 * cells + region_of[i] * n + d]
+            if diagonal and r == c:
+                cols.append(4 * cells + d)
+            if diagonal and r + c == n - 1:
+                cols.append(4 * cells + n + d)
+            if cage_of[i] >= 0:
+                cols.append(primary + cage_of[i] * n + d)
+            rows.append(cols)
+    return primary + len(cages) * n, rows, primary
+
+
+@functools.lru_cache(maxsize=16)
+def _matrix(box, diagonal=False, regions=None, cages=()):
+    g = geometry_for(box * box)
+    columns, rows, primary = _columns(g, diagonal, regions, cages)
+    return _Matrix(g.size, columns, rows, primary)
+
+
+def _key(values, diagonal, regions, cages):
+    g = geometry_for_cells(len(values))
+    regions = tuple(regions) if regions is not None else None
+    cages = tuple((total, tuple(cells)) for total, cells in cages or ())
+    return g.box, diagonal, regions, cages
+
+
+def dlx_solutions(values, diagonal=False, regions=None, cages=None, budget=None):
+    """Yield every solution of a flat board, as a new list each time.
+
+    ``diagonal`` asks for each digit once on both long diagonals,
+    ``regions`` gives every cell's jigsaw region (replacing the boxes) and
+    ``cages`` is a list of killer cages as (sum, cells). With a ``budget``
+    the search spends one node per choice and may raise ``SearchStopped``.
+    """
+    key = _key(values, diagonal, regions, cages)
+    m = _matrix(*key)
+    if not m.lock.acquire(blocking=False):
+        # another solve is using the shared matrix, so use a private one
+        m = _matrix.__wrapped__(*key)
+        m.lock.acquire()
+    try:
+        yield from _search(m, values, key[3], budget)
+    finally:
+        m.lock.release()
+
+
+def _search(m, values, cages, budget):
+    n = m.n
+    left, right, down, column, count = m.left, m.right, m.down, m.column, m.count
+    row_of, first, cols_of = m.row_of, m.first, m.cols_of
+    cover, uncover = m.cover, m.uncover
+
+    cage_of = {}
+    for k, (_, cells) in enumerate(cages):
+        for i in cells:
+            cage_of[i] = k
+    # running sum, number of filled cells and digits used (as a bitmask) per cage
+    sums = [0] * len(cages)
+    filled = [0] * len(cages)
+    used_digits = [0] * len(cages)
+
+    def fits(r):
+        k = cage_of.get(r // n)
+        if k is None:
+            return True
+        total, cells = cages[k]
+        d = r % n
+        s = sums[k] + d + 1
+        open_cells = len(cells) - filled[k] - 1
+        if not open_cells:
+            return s == total
+        # the open cells take distinct digits the cage has not used yet, so the
+        # smallest and the largest of those bound what they can still add
+        free = [e + 1 for e in range(n) if not (used_digits[k] | 1 << d) >> e & 1]
+        return s + sum(free[:open_cells]) <= total <= s + sum(free[-open_cells:])
+
+    def place(r, sign):
+        k = cage_of.get(r // n)
+        if k is not None:
+            sums[k] += sign * (r % n + 1)
+            filled[k] += sign
+            used_digits[k] ^= 1 << r % n
+
+    # cover the givens, or stop if two of them share a column
+    given_cols = []
+    used = set()
+    for i, v in enumerate(values):
+        if v:
+            r = i * n + v - 1
+            if used.intersection(cols_of[r]) or not fits(r):
+                for c in reversed(given_cols):
+                    uncover(c)
+                return
+            used.update(cols_of[r])
+            place(r, 1)
+            for c in cols_of[r]:
+                cover(c)
+                given_cols.append(c)
+
+    solution = values[:]
+    chosen = []
+    try:
+        advance = True
+        while True:
+            if advance:
+                if budget is not None:
+                    budget.spend()
+                if right[0] == 0:
+                    yield solution[:]
+                    advance = False
+                    continue
+                # branch on the column with the fewest rows left
+                best, c = -1, right[0]
+                fewest = n + 1
+                while c:
+                    size = count[c]
+                    if cages and size < fewest:
+                        # with cages, only rows that keep the sums reachable count
+                        size = 0
+                        i = down[c]
+                        while i != c:
+                            if fits(row_of[i]):
+                                size += 1
+                            i = down[i]
+                    if size < fewest:
+                        best, fewest = c, size
+                        if fewest < 2:
+                            break
+                    c = right[c]
+                if fewest == 0:
+                    advance = False
+                    continue
+                cover(best)
+                node = down[best]
+            else:
+                # undo the deepest choice and move on to the next row in its column
+                if not chosen:
+                    return
+                node = chosen.pop()
+                r = row_of[node]
+                j = left[node]
+                while j != node:
+                    uncover(column[j])
+                    j = left[j]
+                place(r, -1)
+                solution[r // n] = 0
+                node = down[node]
+
+            c = column[node]
+            while node != c and not fits(row_of[node]):
+                node = down[node]
+            if node == c:
+                uncover(c)
+                advance = False
+                continue
+            r = row_of[node]
+            chosen.append(node)
+            place(r, 1)
+            solution[r // n] = r % n + 1
+            j = right[node]
+            while j != node:
+                cover(column[j])
+                j = right[j]
+            advance = True
+    finally:
+        # put the matrix back the way it was for the next solve
+        while chosen:
+            node = chosen.pop()
+            j = left[node]
+            while j != node:
+                uncover(column[j])
+                j = left[j]
+            uncover(column[node])
+        for c in reversed(given_cols):
+            uncover(c)
+
+
+def solve_dlx(values, budget=None, **variant):
+    """First solution of a flat board with the DLX engine, or None."""
+    for solution in dlx_solutions(values, budget=budget, **variant):
+        return solution
+    return None
+
+
+def count_dlx(values, limit=2, budget=None, **variant):
+    """Count solutions with the DLX engine, stopping once ``limit`` is reached."""
+    total = 0
+    for _ in dlx_solutions(values, budget=budget, **variant):
+        total += 1
+        if total >= limit:
+            break
+    return total
@@ -0,0 +1,88 @@
+import random
+
+from sudoku_core.board import unflatten
+from sudoku_core.logic import HIDDEN_SINGLE, NAKED_PAIR, NAKED_SINGLE, grade
+from sudoku_core.solver import count_values, solve_values
+from sudoku_core.tables import BOX_UNITS
+
+# hardest technique each tier may need (None means logic alone is not
+# enough) and the number of clues digging stops at
+DIFFICULTIES = {
+    'easy': (NAKED_SINGLE, 36),
+    'medium': (HIDDEN_SINGLE, 30),
+    'hard': (NAKED_PAIR, 0),
+    'expert': (None, 0),
+}
+
+
+def difficulty_of(values):
+    hardest = grade(values)
+    if hardest is None:
+        return 'expert'
+    for name, (limit, _) in DIFFICULTIES.items():
+        if limit is not None and hardest <= limit:
+            return name
+
+
+def random_solution(rng):
+    # the three diagonal boxes are independent, so fill them with random
+    # permutations and let the solver complete the rest
+    values = [0] * 81
+    for box in (0, 4, 8):
+        digits = rng.sample(range(1, 10), 9)
+        for cell, digit in zip(BOX_UNITS[box], digits):
+            values[cell] = digit
+    values = solve_values(values)
+    # relabel digits so the solver's low-digit-first order does not show
+    relabel = [0] + rng.sample(range(1, 10), 9)
+    return [relabel[v] for v in values]
+
+
+def _keeps_tier(values, limit):
+    if limit is None:
+        return count_values(values, 2) == 1
+    # logic deductions are sound, so a puzzle they solve is already unique
+    hardest = grade(values, limit)
+    return hardest is not None and hardest <= limit
+
+
+def dig(solution, difficulty, rng):
+    limit, min_clues = DIFFICULTIES[difficulty]
+    puzzle = solution[:]
+    clues = 81
+    cells = list(range(81))
+    rng.shuffle(cells)
+    for cell in cells:
+        if clues <= min_clues:
+            break
+        digit = puzzle[cell]
+        puzzle[cell] = 0
+        if _keeps_tier(puzzle, limit):
+            clues -= 1
+        else:
+            puzzle[cell] = digit
+    return puzzle
+
+
+def generate(difficulty='medium', rng=None, attempts=20):
+    """Return (puzzle, solution) as flat 81-int lists with a unique solution.
+
+    Clues are removed in random order for as long as the solution stays unique,
+    the puzzle stays within the tier's hardest technique and the tier's clue
+    floor is not reached. The puzzle from the last attempt is returned if none
+    lands exactly on the tier.
+    """
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty: {difficulty}")
+    rng = rng or random.Random()
+    for _ in range(attempts):
+        solution = random_solution(rng)
+        puzzle = dig(solution, difficulty, rng)
+        if difficulty_of(puzzle) == difficulty:
+            break
+    return puzzle, solution
+
+
+def generate_puzzle(difficulty='medium', rng=None):
+    puzzle, _ = generate(difficulty, rng)
+    return unflatten(puzzle)
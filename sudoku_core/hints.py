@@ -0,0 +1,204 @@
+from array import array
+from collections import namedtuple
+
+from sudoku_core.logic import INTERSECTIONS, candidate_grid
+from sudoku_core.solver import DIGIT_OF_BIT, POPCOUNT
+from sudoku_core.tables import BOX_OF, COL_OF, COL_UNITS, PEERS, ROW_OF, ROW_UNITS, UNITS
+
+# ``cell`` and ``digit`` are set for a placement, ``removals`` lists the
+# (row, col, digit) candidates an elimination rules out
+Hint = namedtuple('Hint', 'technique cell digit removals explanation')
+
+UNIT_NAMES = [f"{kind} {k + 1}" for kind in ('row', 'column', 'box') for k in range(9)]
+
+
+def _name(i):
+    return f"cell {ROW_OF[i] + 1},{COL_OF[i] + 1}"
+
+
+def _names(cells):
+    names = [_name(i) for i in cells]
+    if len(names) == 1:
+        return names[0]
+    return ", ".join(names[:-1]) + " and " + names[-1]
+
+
+def _digits(mask):
+    return [DIGIT_OF_BIT[1 << d] for d in range(9) if mask >> d & 1]
+
+
+def _elimination(technique, cands, cells, mask, reason):
+    removals = [(ROW_OF[i], COL_OF[i], d) for i in cells for d in _digits(cands[i] & mask)]
+    if not removals:
+        return None
+    digits = " and ".join(str(d) for d in _digits(mask))
+    touched = [i for i in cells if cands[i] & mask]
+    return Hint(technique, None, None, removals, f"{reason}, so {digits} can be removed from {_names(touched)}.")
+
+
+def _contradiction(values, cands):
+    for i in range(81):
+        if not values[i] and not cands[i]:
+            return Hint('contradiction', (ROW_OF[i], COL_OF[i]), None, [],
+                        f"No digit fits {_name(i)} any more, so a number on the board is wrong.")
+    return None
+
+
+def _naked_single(values, cands):
+    for i in range(81):
+        if cands[i] and POPCOUNT[cands[i]] == 1:
+            d = DIGIT_OF_BIT[cands[i]]
+            return Hint('naked single', (ROW_OF[i], COL_OF[i]), d, [],
+                        f"{d} is the only digit left for {_name(i)}.")
+    return None
+
+
+def _hidden_single(values, cands):
+    for u, unit in enumerate(UNITS):
+        once = twice = 0
+        for i in unit:
+            twice |= once & cands[i]
+            once |= cands[i]
+        hidden = once & ~twice
+        if hidden:
+            bit = hidden & -hidden
+            i = next(i for i in unit if cands[i] & bit)
+            d = DIGIT_OF_BIT[bit]
+            return Hint('hidden single', (ROW_OF[i], COL_OF[i]), d, [],
+                        f"{_name(i)} is the only place for {d} in {UNIT_NAMES[u]}.")
+    return None
+
+
+def _locked_candidates(values, cands):
+    for cells, line_rest, box_rest in INTERSECTIONS:
+        mask = 0
+        for i in cells:
+            mask |= cands[i]
+        if not mask:
+            continue
+        box = UNIT_NAMES[18 + BOX_OF[cells[0]]]
+        if ROW_OF[cells[0]] == ROW_OF[cells[1]]:
+            line = UNIT_NAMES[ROW_OF[cells[0]]]
+        else:
+            line = UNIT_NAMES[9 + COL_OF[cells[0]]]
+        box_mask = line_mask = 0
+        for i in box_rest:
+            box_mask |= cands[i]
+        for i in line_rest:
+            line_mask |= cands[i]
+        for bit in (1 << d for d in range(9)):
+            if not mask & bit:
+                continue
+            if not box_mask & bit and line_mask & bit:
+                return _elimination('pointing', cands, line_rest, bit,
+                                    f"In {box}, {DIGIT_OF_BIT[bit]} can only go in {line}")
+            if not line_mask & bit and box_mask & bit:
+                return _elimination('claiming', cands, box_rest, bit,
+                                    f"In {line}, {DIGIT_OF_BIT[bit]} can only go in {box}")
+    return None
+
+
+def _naked_pair(values, cands):
+    for u, unit in enumerate(UNITS):
+        pairs = {}
+        for i in unit:
+            if POPCOUNT[cands[i]] == 2:
+                pairs.setdefault(cands[i], []).append(i)
+        for mask, cells in pairs.items():
+            if len(cells) != 2:
+                continue
+            rest = [i for i in unit if i not in cells]
+            if any(cands[i] & mask for i in rest):
+                first, second = _digits(mask)
+                return _elimination('naked pair', cands, rest, mask,
+                                    f"{_names(cells)} in {UNIT_NAMES[u]} can only hold {first} and {second}")
+    return None
+
+
+def _x_wing(values, cands):
+    for lines, crossing, kind, other in ((ROW_UNITS, COL_UNITS, 'rows', 'columns'),
+                                         (COL_UNITS, ROW_UNITS, 'columns', 'rows')):
+        for bit in (1 << d for d in range(9)):
+            # where the digit can go along each line, as a bitmask of positions
+            seen = {}
+            for k, line in enumerate(lines):
+                spots = 0
+                for pos, i in enumerate(line):
+                    if cands[i] & bit:
+                        spots |= 1 << pos
+                if POPCOUNT[spots] != 2:
+                    continue
+                if spots not in seen:
+                    seen[spots] = k
+                    continue
+                first = seen[spots]
+                a, b = [pos for pos in range(9) if spots >> pos & 1]
+                rest = [i for pos in (a, b) for i in crossing[pos] if i not in lines[first] and i not in line]
+                if any(cands[i] & bit for i in rest):
+                    return _elimination('x-wing', cands, rest, bit,
+                                        f"In {kind} {first + 1} and {k + 1}, {DIGIT_OF_BIT[bit]} "
+                                        f"can only go in {other} {a + 1} and {b + 1}")
+    return None
+
+
+FINDERS = [_contradiction, _naked_single, _hidden_single, _locked_candidates, _naked_pair, _x_wing]
+
+
+class HintEngine:
+    """Live candidate grid for a board that answers "what is the next logical step?".
+
+    Filling a cell only touches its 20 peers. Erasing or changing a cell can
+    bring candidates back, so that rebuilds the grid and forgets the
+    eliminations earlier hints made.
+    """
+
+    def __init__(self, board):
+        self.load(board)
+
+    def load(self, board):
+        # a byte per cell and a 16-bit candidate mask per cell, not lists of ints
+        self.values = bytearray(int(board[r][c]) for r in range(9) for c in range(9))
+        self.cands = array('H', candidate_grid(self.values))
+
+    def matches(self, board):
+        """Whether the engine is following ``board``, i.e. holds the same digits."""
+        return self.values == bytearray(int(board[r][c]) for r in range(9) for c in range(9))
+
+    def set(self, row, col, value):
+        i = row * 9 + col
+        old = self.values[i]
+        if old == value:
+            return
+        self.values[i] = value
+        if old:
+            self.cands = array('H', candidate_grid(self.values))
+            return
+        bit = 1 << (value - 1)
+        self.cands[i] = 0
+        for p in PEERS[i]:
+            self.cands[p] &= ~bit
+
+    def candidates(self, row, col):
+        return _digits(self.cands[row * 9 + col])
+
+    def most_constrained(self):
+        """(row, col) of the empty cell with the fewest candidates left, or None on a full board."""
+        empty = [i for i in range(81) if not self.values[i]]
+        if not empty:
+            return None
+        i = min(empty, key=lambda i: POPCOUNT[self.cands[i]])
+        return ROW_OF[i], COL_OF[i]
+
+    def next_hint(self):
+        """The simplest step that makes progress, or None if these techniques are stuck.
+
+        An elimination is applied to the grid when it is handed out, so the
+        next call moves on to the step after it.
+        """
+        for find in FINDERS:
+            hint = find(self.values, self.cands)
+            if hint is not None:
+                for r, c, d in hint.removals:
+                    self.cands[r * 9 + c] &= ~(1 << (d - 1))
+                return hint
+        return None
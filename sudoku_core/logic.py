@@ -0,0 +1,143 @@
+from sudoku_core.solver import ALL_DIGITS, DIGIT_OF_BIT, POPCOUNT
+from sudoku_core.tables import BOX_OF, BOX_UNITS, COL_OF, COL_UNITS, PEERS, ROW_OF, ROW_UNITS, UNITS
+
+NAKED_SINGLE = 0
+HIDDEN_SINGLE = 1
+LOCKED_CANDIDATES = 2
+NAKED_PAIR = 3
+TECHNIQUES = ['naked single', 'hidden single', 'locked candidates', 'naked pair']
+
+# (cells where a line crosses a box, rest of the line, rest of the box)
+INTERSECTIONS = [
+    (sorted(set(line) & set(box)), sorted(set(line) - set(box)), sorted(set(box) - set(line)))
+    for line in ROW_UNITS + COL_UNITS for box in BOX_UNITS if set(line) & set(box)
+]
+
+
+def candidate_grid(values):
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    for i in range(81):
+        if values[i]:
+            bit = 1 << (values[i] - 1)
+            rows[ROW_OF[i]] |= bit
+            cols[COL_OF[i]] |= bit
+            boxes[BOX_OF[i]] |= bit
+    return [0 if values[i] else ALL_DIGITS & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+            for i in range(81)]
+
+
+def _place(values, cands, cell, bit):
+    values[cell] = DIGIT_OF_BIT[bit]
+    cands[cell] = 0
+    for p in PEERS[cell]:
+        cands[p] &= ~bit
+
+
+def _naked_single(values, cands):
+    # placing every single found in one sweep gives the same grade as placing
+    # them one at a time and saves a rescan per cell
+    placed = False
+    for i in range(81):
+        if cands[i] and POPCOUNT[cands[i]] == 1:
+            _place(values, cands, i, cands[i])
+            placed = True
+    return placed
+
+
+def _hidden_single(values, cands):
+    for unit in UNITS:
+        once = twice = 0
+        for i in unit:
+            twice |= once & cands[i]
+            once |= cands[i]
+        hidden = once & ~twice
+        if hidden:
+            bit = hidden & -hidden
+            for i in unit:
+                if cands[i] & bit:
+                    _place(values, cands, i, bit)
+                    return True
+    return False
+
+
+def _strip(cands, cells, mask):
+    changed = False
+    for i in cells:
+        if cands[i] & mask:
+            cands[i] &= ~mask
+            changed = True
+    return changed
+
+
+def _or(cands, cells):
+    mask = 0
+    for i in cells:
+        mask |= cands[i]
+    return mask
+
+
+def _locked_candidates(values, cands):
+    for cells, line_rest, box_rest in INTERSECTIONS:
+        mask = _or(cands, cells)
+        if not mask:
+            continue
+        # pointing: digits the box only has here can go nowhere else on the line
+        pointing = mask & ~_or(cands, box_rest)
+        if pointing and _strip(cands, line_rest, pointing):
+            return True
+        # claiming: digits the line only has here can go nowhere else in the box
+        claiming = mask & ~_or(cands, line_rest)
+        if claiming and _strip(cands, box_rest, claiming):
+            return True
+    return False
+
+
+def _naked_pair(values, cands):
+    for unit in UNITS:
+        pairs = {}
+        for i in unit:
+            if POPCOUNT[cands[i]] == 2:
+                pairs.setdefault(cands[i], []).append(i)
+        for mask, cells in pairs.items():
+            if len(cells) != 2:
+                continue
+            changed = False
+            for i in unit:
+                if i not in cells and cands[i] & mask:
+                    cands[i] &= ~mask
+                    changed = True
+            if changed:
+                return True
+    return False
+
+
+STEPS = [_naked_single, _hidden_single, _locked_candidates, _naked_pair]
+
+
+def logic_solve(values, max_technique=NAKED_PAIR):
+    """Apply the simplest technique that makes progress until stuck.
+
+    Returns (values, hardest) where ``values`` is a new list that may still
+    contain zeros and ``hardest`` is the index of the hardest technique used
+    (-1 if none was needed).
+    """
+    values = values[:]
+    cands = candidate_grid(values)
+    hardest = -1
+    while True:
+        for level in range(max_technique + 1):
+            if STEPS[level](values, cands):
+                hardest = max(hardest, level)
+                break
+        else:
+            return values, hardest
+
+
+def grade(values, max_technique=NAKED_PAIR):
+    """Hardest technique needed to solve ``values``, or None if logic alone gets stuck."""
+    solved, hardest = logic_solve(values, max_technique)
+    if 0 in solved:
+        return None
+    return hardest
@@ -0,0 +1,60 @@
+import sqlite3
+import threading
+import time
+
+from sudoku_core.board import Board
+
+DB_PATH = 'saved_games.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    slot TEXT PRIMARY KEY,
+    puzzle BLOB NOT NULL,
+    board BLOB NOT NULL,
+    elapsed REAL NOT NULL,
+    saved_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# Streamlit starts a new thread for every rerun, so a connection per thread
+# would never be reused. One connection per database is shared by the whole
+# process instead, and the lock keeps two sessions from using it at once.
+_connections = {}
+_lock = threading.Lock()
+
+
+def _connect(path):
+    # called with _lock held
+    conn = _connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        # WAL lets readers work while a save is being committed
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(SCHEMA)
+        _connections[path] = conn
+    return conn
+
+
+def save_game(slot, puzzle, board, elapsed_time=0, path=DB_PATH):
+    """Save ``board`` (and the ``puzzle`` it started from) under ``slot``, replacing any earlier save."""
+    puzzle, board = Board.from_rows(puzzle), Board.from_rows(board)
+    with _lock, _connect(path) as conn:
+        conn.execute(
+            "INSERT INTO saves (slot, puzzle, board, elapsed, saved_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(slot) DO UPDATE SET puzzle = excluded.puzzle, board = excluded.board, "
+            "elapsed = excluded.elapsed, saved_at = excluded.saved_at",
+            (slot, puzzle.encode(), board.encode(), float(elapsed_time), time.time()),
+        )
+
+
+def load_game(slot, path=DB_PATH):
+    """Return (puzzle, board, elapsed_time) saved under ``slot``, or None if there is no save."""
+    with _lock:
+        row = _connect(path).execute(
+            "SELECT puzzle, board, elapsed FROM saves WHERE slot = ?", (slot,)
+        ).fetchone()
+    if row is None:
+        return None
+    puzzle, board, elapsed = row
+    return Board(puzzle), Board(board), elapsed
@@ -0,0 +1,81 @@
+import argparse
+import math
+import sys
+import time
+from collections import namedtuple
+
+from sudoku_core.batch import UNSOLVED, map_stream, parse_line
+from sudoku_core.logic import TECHNIQUES, logic_solve
+from sudoku_core.solver import Budget, SearchStopped, count_values
+
+# what a puzzle the techniques cannot finish is rated as needing
+GUESSING = 'guessing'
+# base score for the hardest technique needed, in TECHNIQUES order and then guessing
+TECHNIQUE_SCORES = [1.0, 2.0, 3.5, 5.0, 7.0]
+# search nodes spent on one puzzle before it is left unrated
+MAX_NODES = 200000
+
+Rating = namedtuple('Rating', 'score technique nodes')
+
+
+def rate(values):
+    """Rate a flat 9x9 puzzle by the hardest technique it needs and how much
+    searching it takes to solve and prove unique.
+
+    The score is the technique's base score plus a quarter point for every
+    doubling of the search nodes, so guessing-heavy puzzles keep climbing.
+    Returns None for a puzzle without exactly one solution, or one that
+    needs more than MAX_NODES nodes.
+    """
+    budget = Budget(max_nodes=MAX_NODES)
+    try:
+        if count_values(values, 2, budget) != 1:
+            return None
+    except SearchStopped:
+        return None
+    solved, hardest = logic_solve(values)
+    level = len(TECHNIQUES) if 0 in solved else max(hardest, 0)
+    technique = GUESSING if level == len(TECHNIQUES) else TECHNIQUES[level]
+    score = TECHNIQUE_SCORES[level] + math.log2(budget.nodes) / 4
+    return Rating(round(score, 2), technique, budget.nodes)
+
+
+def rate_line(line):
+    puzzle = line.strip()
+    values = parse_line(line)
+    rating = rate(values) if values is not None and len(values) == 81 else None
+    if rating is None:
+        return f"{puzzle},{UNSOLVED}"
+    return f"{puzzle},{rating.score},{rating.technique},{rating.nodes}"
+
+
+def rate_chunk(lines):
+    return [rate_line(line) for line in lines]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rate a file of 9x9 puzzles, one 81-character line per puzzle.")
+    parser.add_argument('input', help="puzzle file, or - for stdin")
+    parser.add_argument('-o', '--output', default='-',
+                        help="CSV of puzzle,score,technique,nodes (puzzle,- if unrated), or - for stdout (default)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="puzzles per task")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    start = time.perf_counter()
+    try:
+        puzzles, rated = map_stream(source, out, rate_chunk, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    rate_per_second = puzzles / elapsed if elapsed else 0
+    print(f"Rated {rated} of {puzzles} puzzles in {elapsed:.1f}s ({rate_per_second:.0f} puzzles/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import functools
+import math
+
+import streamlit as st
+
+from sudoku_core.board import SIDE_OF_CELLS, SYMBOLS, Board
+
+CSS = (
+    "<style>"
+    ".sudoku-table td { border: 1px solid #000; text-align: center; width: 50px; height: 50px; }"
+    ".sudoku-table .top { border-top: 3px solid #000; }"
+    ".sudoku-table .left { border-left: 3px solid #000; }"
+    ".sudoku-table .bottom { border-bottom: 3px solid #000; }"
+    ".sudoku-table .right { border-right: 3px solid #000; }"
+    ".sudoku-table .conflict { background-color: #ffcccc; }"
+    ".sudoku-table .placed { background-color: #d6f5d6; }"
+    ".sudoku-table .guess { background-color: #fff2b3; }"
+    ".sudoku-table .backtrack { background-color: #e0e0e0; }"
+    "</style>"
+)
+
+
+def _cell_class(i, j, conflict=False, box=3):
+    cell_class = []
+    if i % box == 0:
+        cell_class.append("top")
+    if j % box == 0:
+        cell_class.append("left")
+    if i == box * box - 1:
+        cell_class.append("bottom")
+    if j == box * box - 1:
+        cell_class.append("right")
+    if conflict:
+        cell_class.append("conflict")
+    return " ".join(cell_class)
+
+
+@functools.lru_cache(maxsize=None)
+def _cell_openings(box):
+    # opening <td> of every cell, plain and highlighted, built once per box size
+    n = box * box
+    plain = [f"<td class='{_cell_class(k // n, k % n, False, box)}'>" for k in range(n * n)]
+    conflict = [f"<td class='{_cell_class(k // n, k % n, True, box)}'>" for k in range(n * n)]
+    return plain, conflict
+
+
+CELL_TEXT = {symbol: str(value) if value else '' for value, symbol in enumerate(SYMBOLS)}
+
+
+def add_css():
+    # Streamlit drops elements a rerun does not re-emit, so the pages call this
+    # once per run, right before the board
+    st.markdown(CSS, unsafe_allow_html=True)
+
+
+def board_fingerprint(board):
+    if isinstance(board, Board):
+        return board.to_string()
+    return ''.join(SYMBOLS[int(cell)] for row in board for cell in row)
+
+
+def render_cells(cells, n):
+    """HTML table from the ``<td>`` of each cell of an ``n`` x ``n`` board, row by row."""
+    rows = ["<tr>" + "".join(cells[r * n:r * n + n]) + "</tr>" for r in range(n)]
+    return "<table class='sudoku-table'>" + "".join(rows) + "</table>"
+
+
+@functools.lru_cache(maxsize=1024)
+def _render(fingerprint, conflicts):
+    n = SIDE_OF_CELLS[len(fingerprint)]
+    plain, conflict = _cell_openings(math.isqrt(n))
+    cells = [
+        (conflict[k] if k in conflicts else plain[k]) + CELL_TEXT[fingerprint[k]] + "</td>"
+        for k in range(n * n)
+    ]
+    return render_cells(cells, n)
+
+
+def render_board_with_borders(board, conflicts=()):
+    """HTML table for ``board``, memoized on the board's one-symbol-per-cell fingerprint."""
+    n = len(board)
+    return _render(board_fingerprint(board), frozenset(i * n + j for i, j in conflicts))
+
+
+def board_cells(board):
+    """The ``<td>`` of every cell of ``board``, row by row, for ``render_cells``."""
+    plain, _ = _cell_openings(math.isqrt(len(board)))
+    fingerprint = board_fingerprint(board)
+    return [plain[k] + CELL_TEXT[fingerprint[k]] + "</td>" for k in range(len(fingerprint))]
+
+
+def render_cell(board, index, step=''):
+    """The ``<td>`` of the flat cell ``index``, with ``step`` naming its
+    highlight (a CSS class: placed, guess or backtrack)."""
+    n = len(board)
+    classes = _cell_class(index // n, index % n, False, math.isqrt(n))
+    if step:
+        classes += " " + step
+    return f"<td class='{classes}'>{CELL_TEXT[SYMBOLS[board[index // n][index % n]]]}</td>"
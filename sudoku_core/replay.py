@@ -0,0 +1,105 @@
+import time
+
+import streamlit as st
+
+from sudoku_core.render import board_cells, render_cell, render_cells
+from sudoku_core.solver import solve_steps
+
+# highlight for the cell each kind of step changed
+STEP_CLASS = {'naked single': 'placed', 'hidden single': 'placed', 'guess': 'guess', 'backtrack': 'backtrack'}
+# seconds between redraws while a replay plays
+TICK = 0.2
+
+
+class Replay:
+    """A solve of ``board`` played back a few steps at a time.
+
+    The steps come straight from ``solve_steps``, so nothing is stored up
+    front. Nothing waits between steps either: each call to ``advance`` takes
+    the steps that are due by then, so the page only has to draw the board
+    on a timer, and a replay cut off by a rerun carries on from the same step.
+
+    The board's cells are rendered once and a step re-renders only the cell
+    it changed. The table still goes out whole on every tick, because a
+    fragment rerun clears and redraws everything the fragment wrote, so
+    placeholders for single cells would not outlive a tick.
+    """
+
+    def __init__(self, board):
+        self.board = board.snapshot()
+        self.steps = solve_steps(self.board.values())
+        self.cells = board_cells(self.board)
+        self.count = 0
+        self.last = None
+        self.done = False
+        # when ``advance`` last ran, and the steps owed since then
+        self.clock = None
+        self.due = 1.0
+
+    def advance(self, speed):
+        """Take the steps due at ``speed`` steps a second; returns False once the solve has ended."""
+        now = time.monotonic()
+        if self.clock is not None:
+            # a slow tick catches up by at most a second's worth of steps
+            self.due = min(self.due + (now - self.clock) * speed, max(speed, 1))
+        self.clock = now
+        while self.due >= 1 and not self.done:
+            step = next(self.steps, None)
+            if step is None:
+                self.done = True
+                break
+            self.board.set(step[0], step[1])
+            self.cells[step[0]] = render_cell(self.board, step[0])
+            self.count += 1
+            self.last = step
+            self.due -= 1
+        return not self.done
+
+    def render(self):
+        cells = self.cells
+        if self.last is not None:
+            cell, _, reason = self.last
+            cells = cells[:]
+            cells[cell] = render_cell(self.board, cell, STEP_CLASS[reason])
+        return render_cells(cells, len(self.board))
+
+    def caption(self):
+        if self.last is None:
+            return "Starting the replay..."
+        cell, digit, reason = self.last
+        n = len(self.board)
+        name = f"cell {cell // n + 1},{cell % n + 1}"
+        if digit:
+            return f"Step {self.count}: {digit} in {name} ({reason})"
+        return f"Step {self.count}: backtrack, {name} cleared"
+
+    def outcome(self):
+        """(element, message) for the end of the replay."""
+        if 0 in self.board.values():
+            return 'warning', f"No solution fits the numbers on the board, gave up after {self.count} steps.❌"
+        return 'success', f"Solved in {self.count} steps.✅"
+
+
+@st.fragment(run_every=TICK)
+def play_replay(speed):
+    """Draw ``st.session_state.replay`` and move it on every ``TICK`` seconds,
+    at ``speed`` steps a second. Only this fragment reruns while it plays;
+    once the solve ends the replay is dropped and the whole page reruns.
+    """
+    replay = st.session_state.replay
+    if replay is None:
+        return
+    if not replay.advance(speed):
+        st.session_state.replay = None
+        st.session_state.replay_outcome = replay.outcome()
+        st.rerun()
+    st.markdown(replay.render(), unsafe_allow_html=True)
+    st.caption(replay.caption())
+
+
+def show_replay_outcome(container):
+    """Show how the last replay ended, once."""
+    outcome = st.session_state.pop('replay_outcome', None)
+    if outcome is not None:
+        element, message = outcome
+        getattr(container, element)(message)
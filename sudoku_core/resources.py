@@ -0,0 +1,29 @@
+import importlib
+import threading
+
+import streamlit as st
+
+from sudoku_core.bank import open_bank
+
+# what the board editor pulls in the first time it is shown; st.data_editor
+# hands its data to the browser through pyarrow
+EDITOR_MODULES = ('pandas', 'pyarrow')
+
+
+def _load():
+    for name in EDITOR_MODULES:
+        importlib.import_module(name)
+    open_bank()
+
+
+@st.cache_resource(show_spinner=False)
+def warm_up():
+    """Start loading what the game pages need, once per process.
+
+    The imports and the puzzle bank load in a background thread, so the
+    calling page is not held up and a game page opened after it finds them
+    ready. Returns the thread.
+    """
+    thread = threading.Thread(target=_load, name='sudoku-warm-up', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,11 @@
+import uuid
+
+import streamlit as st
+
+
+def session_slot():
+    """Save slot of this browser session, kept in the URL so a page refresh finds it again."""
+    if 'save_slot' not in st.session_state:
+        st.session_state.save_slot = st.query_params.get('slot') or uuid.uuid4().hex
+    st.query_params['slot'] = st.session_state.save_slot
+    return st.session_state.save_slot
@@ -0,0 +1,375 @@
+import time
+from collections import namedtuple
+
+from sudoku_core.board import Board
+from sudoku_core.dlx import dlx_solutions, solve_dlx
+from sudoku_core.tables import CLASSIC, geometry_for_cells
+
+# bit (d - 1) stands for digit d, these are the 9x9 tables
+ALL_DIGITS = CLASSIC.all_digits
+POPCOUNT = CLASSIC.popcount
+DIGIT_OF_BIT = CLASSIC.digit_of_bit
+
+SOLVED = 'solved'
+UNSOLVABLE = 'unsolvable'
+BUDGET_EXCEEDED = 'budget exceeded'
+CANCELLED = 'cancelled'
+# how long the pages let one Solve click search before giving up
+SOLVE_TIME_LIMIT = 2.0
+
+# the search engines ``solve_sudoku`` and ``solve`` can use
+ENGINES = ('masks', 'dlx')
+
+SolveResult = namedtuple('SolveResult', 'status solutions nodes elapsed')
+
+
+class SearchStopped(Exception):
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class Budget:
+    """Limits for one search: a node count, a time limit in seconds and a
+    cancellation token (anything with ``is_set()``, e.g. ``threading.Event``).
+
+    The search calls ``spend`` once per node and stops with ``SearchStopped``
+    when a limit is hit.
+    """
+
+    __slots__ = ('max_nodes', 'deadline', 'cancel', 'nodes', 'start')
+
+    def __init__(self, max_nodes=None, time_limit=None, cancel=None):
+        self.start = time.perf_counter()
+        self.max_nodes = max_nodes
+        self.deadline = None if time_limit is None else self.start + time_limit
+        self.cancel = cancel
+        self.nodes = 0
+
+    def spend(self):
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchStopped(BUDGET_EXCEEDED)
+        # the clock and the token are only polled every 64 nodes, a node is cheaper than either
+        if self.nodes & 63 == 0:
+            if self.cancel is not None and self.cancel.is_set():
+                raise SearchStopped(CANCELLED)
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise SearchStopped(BUDGET_EXCEEDED)
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+
+def _read_grid(grid):
+    if isinstance(grid, Board):
+        return grid.values()
+    return [int(cell) for row in grid for cell in row]
+
+
+def _write_grid(grid, values):
+    if isinstance(grid, Board):
+        grid.load(values)
+        return
+    n = len(grid)
+    for i, v in enumerate(values):
+        grid[i // n][i % n] = v
+
+
+def _init_masks(values, g):
+    row_of, col_of, box_of = g.row_of, g.col_of, g.box_of
+    rows = [0] * g.size
+    cols = [0] * g.size
+    boxes = [0] * g.size
+    for i in range(g.cells):
+        v = values[i]
+        if v:
+            bit = 1 << (v - 1)
+            r, c, b = row_of[i], col_of[i], box_of[i]
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                return None
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+    return rows, cols, boxes
+
+
+def _propagate(values, rows, cols, boxes, trail, g):
+    # Fill naked and hidden singles until nothing changes, appending each
+    # filled cell to ``trail``. Returns the most constrained empty cell and its
+    # candidates, (-1, 0) when the grid is full, or None on a contradiction.
+    row_of, col_of, box_of, units, peers = g.row_of, g.col_of, g.box_of, g.units, g.peers
+    all_digits, popcount, digit_of_bit = g.all_digits, g.popcount, g.digit_of_bit
+    while True:
+        progress = False
+        best, best_cand, best_count = -1, 0, g.size + 1
+        cands = [0] * g.cells
+        for i in range(g.cells):
+            if values[i]:
+                continue
+            r, c, b = row_of[i], col_of[i], box_of[i]
+            cand = all_digits & ~(rows[r] | cols[c] | boxes[b])
+            if not cand:
+                return None
+            if popcount[cand] == 1:
+                values[i] = digit_of_bit[cand]
+                trail.append(i)
+                rows[r] |= cand
+                cols[c] |= cand
+                boxes[b] |= cand
+                progress = True
+                continue
+            cands[i] = cand
+            if popcount[cand] < best_count:
+                best, best_cand, best_count = i, cand, popcount[cand]
+        if progress:
+            continue
+        if best < 0:
+            return -1, 0
+
+        for unit in units:
+            once = twice = placed = 0
+            for i in unit:
+                cand = cands[i]
+                if cand:
+                    twice |= once & cand
+                    once |= cand
+                elif values[i]:
+                    placed |= 1 << (values[i] - 1)
+                else:
+                    return None
+            if (once | placed) != all_digits:
+                return None
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for i in unit:
+                    if cands[i] & bit:
+                        r, c, b = row_of[i], col_of[i], box_of[i]
+                        if (rows[r] | cols[c] | boxes[b]) & bit:
+                            return None
+                        values[i] = digit_of_bit[bit]
+                        trail.append(i)
+                        rows[r] |= bit
+                        cols[c] |= bit
+                        boxes[b] |= bit
+                        # keep the candidates exact for the units still to come
+                        cands[i] = 0
+                        for p in peers[i]:
+                            cands[p] &= ~bit
+                        progress = True
+                        break
+        if not progress:
+            return best, best_cand
+
+
+def _search(values, rows, cols, boxes, limit, first, budget, g):
+    # Depth-first search with an explicit stack. Each frame is [cell, untried
+    # candidates, trail length when the cell was chosen]; backtracking empties
+    # the trail back to that length instead of copying the grid per branch.
+    # Counts solutions up to ``limit`` and appends the first one to ``first``.
+    row_of, col_of, box_of, digit_of_bit = g.row_of, g.col_of, g.box_of, g.digit_of_bit
+    trail = []
+    stack = []
+    count = 0
+    while True:
+        if budget is not None:
+            budget.spend()
+        found = _propagate(values, rows, cols, boxes, trail, g)
+        if found is not None:
+            cell, cand = found
+            if cell >= 0:
+                stack.append([cell, cand, len(trail)])
+            else:
+                count += 1
+                if not first:
+                    first.append(values[:])
+                if count >= limit:
+                    return count
+
+        # undo to the deepest frame with a candidate left and try it
+        while stack:
+            frame = stack[-1]
+            cell, cand, mark = frame
+            for i in trail[mark:]:
+                bit = 1 << (values[i] - 1)
+                rows[row_of[i]] ^= bit
+                cols[col_of[i]] ^= bit
+                boxes[box_of[i]] ^= bit
+                values[i] = 0
+            del trail[mark:]
+            if cand:
+                break
+            stack.pop()
+        else:
+            return count
+        bit = cand & -cand
+        frame[1] = cand ^ bit
+        values[cell] = digit_of_bit[bit]
+        trail.append(cell)
+        rows[row_of[cell]] |= bit
+        cols[col_of[cell]] |= bit
+        boxes[box_of[cell]] |= bit
+
+
+def solve_values(values, budget=None):
+    """Solve a flat list of 81 ints (0 for empty); returns the solved list or None.
+
+    16, 256 and 625 cells solve 4x4, 16x16 and 25x25 boards. With a
+    ``budget`` the search may stop early by raising ``SearchStopped``.
+    """
+    g = geometry_for_cells(len(values))
+    masks = _init_masks(values, g)
+    if masks is None:
+        return None
+    first = []
+    _search(values[:], *masks, 1, first, budget, g)
+    return first[0] if first else None
+
+
+def _check_engine(engine):
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+
+
+def solve_sudoku(grid, engine='masks'):
+    """Solve ``grid`` in place. Returns True when a solution was written.
+
+    ``engine`` is 'masks' for the bitmask search or 'dlx' for dancing links.
+    """
+    _check_engine(engine)
+    solve_with = solve_dlx if engine == 'dlx' else solve_values
+    solved = solve_with(_read_grid(grid))
+    if solved is None:
+        return False
+    _write_grid(grid, solved)
+    return True
+
+
+def count_values(values, limit=2, budget=None):
+    """Count solutions of a flat list of cells, stopping once ``limit`` is reached."""
+    g = geometry_for_cells(len(values))
+    masks = _init_masks(values, g)
+    if masks is None:
+        return 0
+    return _search(values[:], *masks, limit, [], budget, g)
+
+
+def count_solutions(board, limit=2):
+    """Count the solutions of ``board`` up to ``limit`` without modifying it."""
+    return count_values(_read_grid(board), limit)
+
+
+def _search_dlx(values, limit, first, budget):
+    count = 0
+    for solution in dlx_solutions(values, budget=budget):
+        if not first:
+            first.append(solution)
+        count += 1
+        if count >= limit:
+            break
+    return count
+
+
+def solve(grid, limit=2, max_nodes=None, time_limit=None, cancel=None, engine='masks'):
+    """Solve ``grid`` in place within a search budget and report how it went.
+
+    Looks for up to ``limit`` solutions, so the default tells a unique
+    answer from one of many, and writes the first one found into ``grid``.
+    The search gives up after ``max_nodes`` nodes or ``time_limit`` seconds,
+    or as soon as ``cancel.is_set()``. ``engine`` picks the search as in
+    ``solve_sudoku``. Returns a SolveResult with the status, the number of
+    solutions found, the nodes searched and the seconds taken.
+    """
+    _check_engine(engine)
+    budget = Budget(max_nodes, time_limit, cancel)
+    values = _read_grid(grid)
+    g = geometry_for_cells(len(values))
+    first = []
+    try:
+        if engine == 'dlx':
+            solutions = _search_dlx(values, limit, first, budget)
+        else:
+            masks = _init_masks(values, g)
+            solutions = _search(values, *masks, limit, first, budget, g) if masks else 0
+        status = SOLVED if solutions else UNSOLVABLE
+    except SearchStopped as stopped:
+        solutions, status = len(first), stopped.status
+    if first:
+        _write_grid(grid, first[0])
+    return SolveResult(status, solutions, budget.nodes, budget.elapsed())
+
+
+def solve_steps(values, budget=None):
+    """Yield the steps of a solve one at a time as (cell, digit, reason).
+
+    ``cell`` indexes the flat board. ``reason`` is 'naked single' or
+    'hidden single' for a forced digit, 'guess' for a branch, or 'backtrack'
+    (with digit 0) when a wrong guess and what followed it are taken back.
+    The steps follow the search ``solve_values`` makes and end at the first
+    solution; they are produced as the search runs, so a long trace holds no
+    more than the search itself does.
+    """
+    g = geometry_for_cells(len(values))
+    masks = _init_masks(values, g)
+    if masks is None:
+        return
+    values = values[:]
+    rows, cols, boxes = masks
+    row_of, col_of, box_of, digit_of_bit = g.row_of, g.col_of, g.box_of, g.digit_of_bit
+    # the digits the steps so far have shown, to tell a naked single from a hidden one
+    shown_rows, shown_cols, shown_boxes = rows[:], cols[:], boxes[:]
+    trail = []
+    stack = []
+    while True:
+        if budget is not None:
+            budget.spend()
+        start = len(trail)
+        found = _propagate(values, rows, cols, boxes, trail, g)
+        for i in trail[start:]:
+            bit = 1 << (values[i] - 1)
+            r, c, b = row_of[i], col_of[i], box_of[i]
+            seen = shown_rows[r] | shown_cols[c] | shown_boxes[b]
+            yield i, values[i], 'naked single' if g.all_digits & ~seen == bit else 'hidden single'
+            shown_rows[r] |= bit
+            shown_cols[c] |= bit
+            shown_boxes[b] |= bit
+        if found is not None:
+            cell, cand = found
+            if cell < 0:
+                return
+            stack.append([cell, cand, len(trail)])
+
+        while stack:
+            frame = stack[-1]
+            cell, cand, mark = frame
+            for i in reversed(trail[mark:]):
+                bit = 1 << (values[i] - 1)
+                r, c, b = row_of[i], col_of[i], box_of[i]
+                rows[r] ^= bit
+                cols[c] ^= bit
+                boxes[b] ^= bit
+                shown_rows[r] ^= bit
+                shown_cols[c] ^= bit
+                shown_boxes[b] ^= bit
+                values[i] = 0
+                yield i, 0, 'backtrack'
+            del trail[mark:]
+            if cand:
+                break
+            stack.pop()
+        else:
+            return
+        bit = cand & -cand
+        frame[1] = cand ^ bit
+        values[cell] = digit_of_bit[bit]
+        trail.append(cell)
+        r, c, b = row_of[cell], col_of[cell], box_of[cell]
+        rows[r] |= bit
+        cols[c] |= bit
+        boxes[b] |= bit
+        shown_rows[r] |= bit
+        shown_cols[c] |= bit
+        shown_boxes[b] |= bit
+        yield cell, values[cell], 'guess'
@@ -0,0 +1,88 @@
+import functools
+import math
+
+# Index tables for a board, with cells numbered row by row, built once per
+# box size so the solver, the grader and the validator never redo the
+# row/column/box arithmetic in their inner loops.
+
+BOX_SIZES = (2, 3, 4, 5)
+# largest side whose popcount table (2 ** side entries) is worth building
+POPCOUNT_TABLE_LIMIT = 16
+
+
+class _BitCount:
+    # stands in for a popcount table when one would have 2 ** 25 entries
+    def __getitem__(self, mask):
+        return bin(mask).count("1")
+
+
+class Geometry:
+    """Tables for a board with ``box`` x ``box`` boxes, so ``box ** 2`` digits a side."""
+
+    def __init__(self, box):
+        n = box * box
+        self.box = box
+        self.size = n
+        self.cells = n * n
+        self.row_of = [i // n for i in range(n * n)]
+        self.col_of = [i % n for i in range(n * n)]
+        self.box_of = [(i // (n * box)) * box + (i % n) // box for i in range(n * n)]
+
+        self.row_units = [[r * n + c for c in range(n)] for r in range(n)]
+        self.col_units = [[r * n + c for r in range(n)] for c in range(n)]
+        self.box_units = [
+            [(b // box) * n * box + (b % box) * box + (k // box) * n + k % box for k in range(n)] for b in range(n)
+        ]
+        self.units = self.row_units + self.col_units + self.box_units
+
+        # the cells that share a row, column or box with each cell
+        self.peers = [
+            sorted((set(self.row_units[self.row_of[i]]) | set(self.col_units[self.col_of[i]])
+                    | set(self.box_units[self.box_of[i]])) - {i})
+            for i in range(n * n)
+        ]
+        # the same peers as (row, col) pairs, for code that indexes nested boards
+        self.peer_coords = [[(self.row_of[p], self.col_of[p]) for p in self.peers[i]] for i in range(n * n)]
+
+        # bit (d - 1) stands for digit d
+        self.all_digits = (1 << n) - 1
+        self.digit_of_bit = {1 << d: d + 1 for d in range(n)}
+        if n <= POPCOUNT_TABLE_LIMIT:
+            self.popcount = [bin(m).count("1") for m in range(1 << n)]
+        else:
+            self.popcount = _BitCount()
+
+
+@functools.lru_cache(maxsize=None)
+def geometry(box=3):
+    if box not in BOX_SIZES:
+        raise ValueError(f"unsupported box size {box}, expected one of {BOX_SIZES}")
+    return Geometry(box)
+
+
+def geometry_for(side):
+    """Geometry for a board ``side`` digits wide (4, 9, 16 or 25)."""
+    box = math.isqrt(side)
+    if box * box != side:
+        raise ValueError(f"a board side must be a square, not {side}")
+    return geometry(box)
+
+
+def geometry_for_cells(count):
+    """Geometry for a flat board of ``count`` cells (16, 81, 256 or 625)."""
+    side = math.isqrt(count)
+    if side * side != count:
+        raise ValueError(f"a board must have a square number of cells, not {count}")
+    return geometry_for(side)
+
+
+CLASSIC = geometry(3)
+ROW_OF = CLASSIC.row_of
+COL_OF = CLASSIC.col_of
+BOX_OF = CLASSIC.box_of
+ROW_UNITS = CLASSIC.row_units
+COL_UNITS = CLASSIC.col_units
+BOX_UNITS = CLASSIC.box_units
+UNITS = CLASSIC.units
+PEERS = CLASSIC.peers
+PEER_COORDS = CLASSIC.peer_coords
@@ -0,0 +1,66 @@
+import time
+
+import streamlit as st
+
+# The ticker counts in the browser, so a running timer needs no server
+# thread between reruns. The server only re-sends the elapsed time it knows.
+TICKER_HTML = """
+<div style="font-family: 'Source Sans Pro', sans-serif; font-size: 1rem; color: #31333F;">
+{label}: <span id="seconds">{seconds}</span> seconds
+</div>
+<script>
+const base = Date.now() - {elapsed_ms};
+const seconds = document.getElementById("seconds");
+setInterval(() => {{ seconds.textContent = Math.floor((Date.now() - base) / 1000); }}, 1000);
+</script>
+"""
+
+
+def init_timer_state():
+    if 'running' not in st.session_state:
+        st.session_state.running = False
+    if 'start_time' not in st.session_state:
+        st.session_state.start_time = None
+    if 'elapsed_time' not in st.session_state:
+        st.session_state.elapsed_time = 0
+
+
+def start_timer():
+    if st.session_state.start_time is None:  # First start
+        st.session_state.start_time = time.time()
+    else:  # Resume
+        st.session_state.start_time = time.time() - st.session_state.elapsed_time
+    st.session_state.running = True
+
+
+def stop_timer():
+    if st.session_state.running:
+        st.session_state.elapsed_time = time.time() - st.session_state.start_time
+    st.session_state.running = False
+
+
+def reset_timer():
+    st.session_state.elapsed_time = 0
+    st.session_state.start_time = None
+    st.session_state.running = False
+
+
+def restore_timer(elapsed):
+    # stopped, and set up so that Start resumes from ``elapsed``
+    st.session_state.elapsed_time = elapsed
+    st.session_state.start_time = time.time() - elapsed
+    st.session_state.running = False
+
+
+def elapsed_seconds():
+    if st.session_state.running:
+        return time.time() - st.session_state.start_time
+    return st.session_state.elapsed_time
+
+
+def show_timer(container, label, element='write'):
+    elapsed = elapsed_seconds()
+    if st.session_state.running:
+        container.iframe(TICKER_HTML.format(label=label, seconds=int(elapsed), elapsed_ms=int(elapsed * 1000)), height=30)
+    else:
+        getattr(container, element)(f'{label}: {elapsed:.0f} seconds')
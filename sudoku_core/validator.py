@@ -0,0 +1,46 @@
+from sudoku_core.solver import count_solutions
+from sudoku_core.tables import geometry_for
+
+
+def is_valid_sudoku(board):
+    g = geometry_for(len(board))
+    rows = [set() for _ in range(g.size)]
+    cols = [set() for _ in range(g.size)]
+    sub_grids = [set() for _ in range(g.size)]
+
+    for cell in range(g.cells):
+        i, j, subgrid_index = g.row_of[cell], g.col_of[cell], g.box_of[cell]
+        num = board[i][j]
+        if num == 0:
+            return False
+
+        if num in rows[i] or num in cols[j] or num in sub_grids[subgrid_index]:
+            return False
+
+        rows[i].add(num)
+        cols[j].add(num)
+        sub_grids[subgrid_index].add(num)
+
+    return True
+
+
+def is_safe(grid, row, col, num):
+    if grid[row][col] == num:
+        return False
+    g = geometry_for(len(grid))
+    for r, c in g.peer_coords[row * g.size + col]:
+        if grid[r][c] == num:
+            return False
+    return True
+
+
+def safe_values(grid, row, col):
+    """Digits that ``is_safe`` allows at (row, col), found with one pass over its peers."""
+    g = geometry_for(len(grid))
+    used = {grid[r][c] for r, c in g.peer_coords[row * g.size + col]}
+    used.add(grid[row][col])
+    return [num for num in range(1, g.size + 1) if num not in used]
+
+
+def has_unique_solution(board):
+    return count_solutions(board, 2) == 1